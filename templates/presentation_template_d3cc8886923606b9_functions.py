@@ -0,0 +1,301 @@
+"""
+Auto-generated template functions for: presentation-template.pptx
+Template ID: presentation_template_d3cc8886923606b9
+Generated by: Template Analyzer Tool
+"""
+
+import os
+import re
+import json
+import functools
+from xml.sax.saxutils import escape
+from pptx import Presentation
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+from pptx.util import Inches, Pt
+from pptx.enum.text import PP_ALIGN
+from pptx.dml.color import RGBColor
+from typing import List, Optional
+
+
+# Geometry shared by the add_* methods: (left, top, width, height)
+_TITLE_SLIDE_TITLE_BOX = (Inches(1), Inches(2), Inches(8), Inches(1))
+_TITLE_SLIDE_SUBTITLE_BOX = (Inches(1), Inches(3.2), Inches(8), Inches(0.8))
+_TITLE_BOX = (Inches(0.5), Inches(0.5), Inches(9), Inches(0.8))
+_CONTENT_BOX = (Inches(0.5), Inches(1.5), Inches(9), Inches(4))
+_IMAGE_PLACEHOLDER_BOX = (Inches(1.5), Inches(2), Inches(7), Inches(4))
+_LEFT_COLUMN_BOX = (Inches(0.5), Inches(1.5), Inches(4.5), Inches(4))
+_RIGHT_COLUMN_BOX = (Inches(5), Inches(1.5), Inches(4.5), Inches(4))
+_PLACEHOLDER_MARGIN = Inches(0.3)
+
+# Font sizes and line widths
+_PT_TITLE_SLIDE = Pt(44)
+_PT_SUBTITLE = Pt(24)
+_PT_TITLE = Pt(32)
+_PT_BULLET = Pt(18)
+_PT_COLUMN = Pt(14)
+_PT_PROMPT_HEADER = Pt(14)
+_PT_PROMPT = Pt(11)
+_PT_CONTEXT = Pt(10)
+_PT_PROMPT_SPACING = Pt(12)
+_PT_PLACEHOLDER_LINE = Pt(2)
+
+# Text handling for bulk-built paragraphs, same rules as python-pptx's .text
+_LINE_BREAK_RE = re.compile('\n|\v')
+_CTRL_CHAR_RE = re.compile(r'[\x00-\x08\x0B-\x1F]')
+
+# Colors
+_LIGHT_BLUE = RGBColor(232, 244, 248)
+_DARK_BLUE = RGBColor(30, 58, 138)
+_BLACK = RGBColor(0, 0, 0)
+_GRAY = RGBColor(75, 85, 99)
+
+
+_METADATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "presentation_template_d3cc8886923606b9_metadata.json")
+
+
+@functools.lru_cache(maxsize=None)
+def _load_template_metadata() -> dict:
+    """Read the sibling metadata JSON file once per process"""
+    with open(_METADATA_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _append_paragraphs(text_frame, items: List[str], font_size) -> None:
+    """
+    Append one paragraph per item in a single XML splice
+
+    Produces the same markup as add_paragraph() + .text + .font.size per
+    item, without a round of python-pptx proxy calls for each one.
+    """
+    paragraphs = []
+    for item in items:
+        runs = '<a:br/>'.join(
+            f'<a:r><a:t>{escape(_CTRL_CHAR_RE.sub(_escape_ctrl_char, line))}</a:t></a:r>' if line else ''
+            for line in _LINE_BREAK_RE.split(str(item))
+        )
+        paragraphs.append(f'<a:p><a:pPr><a:defRPr sz="{font_size.centipoints}"/></a:pPr>{runs}</a:p>')
+
+    txBody = parse_xml(f'<a:txBody {nsdecls("a")}>{"".join(paragraphs)}</a:txBody>')
+    text_frame._txBody.extend(list(txBody))
+
+
+def _escape_ctrl_char(match) -> str:
+    """Plain-text escape for a control character, e.g. BEL -> _x0007_"""
+    return "_x%04X_" % ord(match.group(0))
+
+
+class PresentationTemplateTemplate:
+    """
+    Auto-generated template functions
+    Template: presentation-template.pptx
+    """
+
+    def __init__(self, template_path: str):
+        """
+        Initialize template
+
+        Args:
+            template_path: Path to template PPTX file
+        """
+        # Load template to get layouts and styling
+        self.prs = Presentation(template_path)
+
+        # Remove all existing slides from template to start clean
+        sldIdLst = self.prs.slides._sldIdLst
+        for rId in [sldId.rId for sldId in sldIdLst]:
+            self.prs.part.drop_rel(rId)
+        del sldIdLst[:]
+
+        self.template_path = template_path
+
+    @property
+    def template_metadata(self) -> dict:
+        """Template metadata, loaded on first access and shared by all instances"""
+        return _load_template_metadata()
+
+    def add_title_slide(self, title: str, subtitle: str = None) -> None:
+        """
+        Add title slide
+
+        Args:
+            title: Main title text
+            subtitle: Subtitle text (optional)
+        """
+        layout = self.prs.slide_layouts[0]
+        slide = self.prs.slides.add_slide(layout)
+        add_textbox = slide.shapes.add_textbox
+
+        # Add title as text box
+        title_frame = add_textbox(*_TITLE_SLIDE_TITLE_BOX).text_frame
+        title_frame.text = title
+        title_para = title_frame.paragraphs[0]
+        title_para.font.size = _PT_TITLE_SLIDE
+        title_para.font.bold = True
+        title_para.alignment = PP_ALIGN.CENTER
+
+        # Add subtitle if provided
+        if subtitle:
+            subtitle_frame = add_textbox(*_TITLE_SLIDE_SUBTITLE_BOX).text_frame
+            subtitle_frame.text = subtitle
+            subtitle_para = subtitle_frame.paragraphs[0]
+            subtitle_para.font.size = _PT_SUBTITLE
+            subtitle_para.alignment = PP_ALIGN.CENTER
+
+    def add_content_slide(self, title: str, bullets: List[str]) -> None:
+        """
+        Add bullet point slide
+
+        Args:
+            title: Slide title
+            bullets: List of bullet points
+        """
+        # Use layout 1 if available, otherwise layout 0
+        layout_idx = min(1, len(self.prs.slide_layouts) - 1)
+        layout = self.prs.slide_layouts[layout_idx]
+        slide = self.prs.slides.add_slide(layout)
+        add_textbox = slide.shapes.add_textbox
+
+        # Add title as text box if no title placeholder
+        self._fill_title(add_textbox(*_TITLE_BOX).text_frame, title)
+
+        # Add bullets as text box
+        text_frame = add_textbox(*_CONTENT_BOX).text_frame
+        text_frame.word_wrap = True
+
+        _append_paragraphs(text_frame, bullets, _PT_BULLET)
+
+    def add_section_header_slide(self, title: str) -> None:
+        """
+        Add section header slide
+
+        Args:
+            title: Section title
+        """
+        # Try to find section header layout (often layout 2 or 3)
+        layout_idx = min(2, len(self.prs.slide_layouts) - 1)
+        layout = self.prs.slide_layouts[layout_idx]
+        slide = self.prs.slides.add_slide(layout)
+
+        title_shape = slide.shapes.title
+        if title_shape:
+            title_shape.text = title
+
+    def add_image_placeholder_slide(self, title: str, image_prompt: str,
+                                     context: str = None) -> None:
+        """
+        Add slide with image placeholder showing prompt
+
+        Args:
+            title: Slide title
+            image_prompt: AI-generated image prompt to display
+            context: Optional context about why this image
+        """
+        # Use blank or content layout
+        layout_idx = min(5, len(self.prs.slide_layouts) - 1)
+        layout = self.prs.slide_layouts[layout_idx]
+        slide = self.prs.slides.add_slide(layout)
+        shapes = slide.shapes
+
+        # Add title box
+        self._fill_title(shapes.add_textbox(*_TITLE_BOX).text_frame, title)
+
+        # Add image placeholder box
+        placeholder_box = shapes.add_shape(
+            1,  # Rectangle (MSO_SHAPE.RECTANGLE)
+            *_IMAGE_PLACEHOLDER_BOX
+        )
+
+        # Style the placeholder
+        fill = placeholder_box.fill
+        fill.solid()
+        fill.fore_color.rgb = _LIGHT_BLUE
+        line = placeholder_box.line
+        line.color.rgb = _DARK_BLUE
+        line.width = _PT_PLACEHOLDER_LINE
+
+        # Add prompt text inside placeholder
+        text_frame = placeholder_box.text_frame
+        text_frame.word_wrap = True
+        text_frame.margin_left = _PLACEHOLDER_MARGIN
+        text_frame.margin_right = _PLACEHOLDER_MARGIN
+        text_frame.margin_top = _PLACEHOLDER_MARGIN
+
+        # Header
+        p1 = text_frame.paragraphs[0]
+        p1.text = "📷 IMAGE PROMPT:"
+        font = p1.font
+        font.size = _PT_PROMPT_HEADER
+        font.bold = True
+        font.color.rgb = _DARK_BLUE
+
+        # Prompt text
+        p2 = text_frame.add_paragraph()
+        p2.text = image_prompt
+        font = p2.font
+        font.size = _PT_PROMPT
+        p2.space_before = _PT_PROMPT_SPACING
+        font.color.rgb = _BLACK
+
+        # Context if provided
+        if context:
+            p3 = text_frame.add_paragraph()
+            p3.text = f"\n💡 Context: {context}"
+            font = p3.font
+            font.size = _PT_CONTEXT
+            font.italic = True
+            p3.space_before = _PT_PROMPT_SPACING
+            font.color.rgb = _GRAY
+
+    def add_two_column_slide(self, title: str, left_content: List[str],
+                            right_content: List[str]) -> None:
+        """
+        Add two-column comparison slide
+
+        Args:
+            title: Slide title
+            left_content: Left column bullet points
+            right_content: Right column bullet points
+        """
+        # Use any available layout
+        layout = self.prs.slide_layouts[0]
+        slide = self.prs.slides.add_slide(layout)
+        add_textbox = slide.shapes.add_textbox
+
+        # Add title
+        self._fill_title(add_textbox(*_TITLE_BOX).text_frame, title)
+
+        # Add two text boxes
+        left_box = add_textbox(*_LEFT_COLUMN_BOX)
+        right_box = add_textbox(*_RIGHT_COLUMN_BOX)
+
+        # Fill both columns
+        for box, items in ((left_box, left_content), (right_box, right_content)):
+            frame = box.text_frame
+            frame.word_wrap = True
+            _append_paragraphs(frame, items, _PT_COLUMN)
+
+    @staticmethod
+    def _fill_title(title_frame, title: str) -> None:
+        """Set the standard bold slide title on a fresh text frame"""
+        title_frame.text = title
+        font = title_frame.paragraphs[0].font
+        font.size = _PT_TITLE
+        font.bold = True
+
+    def save(self, output_path: str) -> str:
+        """
+        Save the presentation
+
+        Args:
+            output_path: Path to save PPTX file
+
+        Returns:
+            Saved file path
+        """
+        self.prs.save(output_path)
+        return output_path
+
+    def get_slide_count(self) -> int:
+        """Get current number of slides"""
+        return len(self.prs.slides)
@@ -0,0 +1,40 @@
+"""
+Shared fixtures for the PPT generator test suite
+"""
+
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+TEMPLATE_PATH = os.path.join(REPO_ROOT, "presentation-template.pptx")
+
+# Add parent directory to path
+sys.path.insert(0, REPO_ROOT)
+
+# Exercise real parsing rather than results cached by earlier runs
+os.environ.setdefault("PREZO_DISK_CACHE", "0")
+
+from tools.template_analyzer import analyze_ppt_template, generate_template_functions
+
+
+@pytest.fixture(scope="session")
+def template_path() -> str:
+    """Path to the sample template shipped with the repo"""
+    if not os.path.exists(TEMPLATE_PATH):
+        pytest.skip(f"Template file not found: {TEMPLATE_PATH}")
+    return TEMPLATE_PATH
+
+
+@pytest.fixture(scope="session")
+def template_metadata(template_path):
+    """Template analyzed once and shared by every test in the session"""
+    return analyze_ppt_template(template_path)
+
+
+@pytest.fixture(scope="session")
+def generated_functions_path(template_metadata, tmp_path_factory) -> str:
+    """Functions module generated once into a temporary directory"""
+    output_dir = tmp_path_factory.mktemp("templates")
+    return generate_template_functions(template_metadata, output_dir=str(output_dir))
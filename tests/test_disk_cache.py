@@ -0,0 +1,154 @@
+"""
+Test the on-disk result cache
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tools import disk_cache
+from tools.disk_cache import disk_cached, load_entry, store_entry
+from tools.document_extractor import extract_document_content
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch) -> str:
+    """Empty, enabled cache in a temporary directory"""
+    path = str(tmp_path / "cache")
+    monkeypatch.setattr(disk_cache, "CACHE_DIR", path)
+    monkeypatch.setenv("PREZO_DISK_CACHE", "1")
+    return path
+
+
+@pytest.fixture
+def source_file(tmp_path) -> str:
+    """File the cached functions read"""
+    path = tmp_path / "source.txt"
+    path.write_text("original", encoding='utf-8')
+    return str(path)
+
+
+def _counting(version=1, ignore=(), result=None):
+    """Cached function recording every real call"""
+    calls = []
+
+    @disk_cached(version=version, ignore=ignore)
+    def read_file(file_path, suffix="", workers=None):
+        calls.append((file_path, suffix, workers))
+        if result is not None:
+            return result
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read() + suffix
+
+    return read_file, calls
+
+
+def test_hit(cache_dir, source_file):
+    """Test a repeated call is served from disk, however arguments are passed"""
+    read_file, calls = _counting()
+    assert read_file(source_file, "!") == "original!"
+    assert read_file(source_file, suffix="!") == "original!"
+    assert len(calls) == 1
+
+    assert read_file(source_file, "?") == "original?"
+    assert len(calls) == 2
+
+
+def test_miss_after_mtime_change(cache_dir, source_file):
+    """Test touching the file invalidates its entry"""
+    read_file, calls = _counting()
+    read_file(source_file)
+    stat = os.stat(source_file)
+    os.utime(source_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    read_file(source_file)
+    assert len(calls) == 2
+
+
+def test_miss_after_size_change(cache_dir, source_file):
+    """Test rewriting the file with different content invalidates its entry"""
+    read_file, calls = _counting()
+    read_file(source_file)
+    stat = os.stat(source_file)
+    with open(source_file, 'w', encoding='utf-8') as f:
+        f.write("changed content")
+    os.utime(source_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert read_file(source_file) == "changed content"
+    assert len(calls) == 2
+
+
+def test_version_bump_is_a_miss(cache_dir, source_file):
+    """Test entries written by an older version are not reused"""
+    read_v1, calls_v1 = _counting(version=1)
+    read_v2, calls_v2 = _counting(version=2)
+    read_v1(source_file)
+    read_v2(source_file)
+    assert len(calls_v1) == 1
+    assert len(calls_v2) == 1
+
+
+def test_ignored_arguments_share_an_entry(cache_dir, source_file):
+    """Test arguments listed in ignore don't split the cache"""
+    read_file, calls = _counting(ignore=("workers",))
+    read_file(source_file, workers=1)
+    read_file(source_file, workers=8)
+    assert len(calls) == 1
+
+
+def test_disabled(cache_dir, source_file, monkeypatch):
+    """Test PREZO_DISK_CACHE=0 neither reads nor writes entries"""
+    monkeypatch.setenv("PREZO_DISK_CACHE", "0")
+    read_file, calls = _counting()
+    read_file(source_file)
+    read_file(source_file)
+    assert len(calls) == 2
+    assert not os.path.exists(cache_dir)
+
+    store_entry(["key"], "value")
+    assert load_entry(["key"]) is None
+
+
+def test_corrupt_entry_is_a_miss(cache_dir, source_file):
+    """Test an unreadable entry is recomputed and rewritten"""
+    read_file, calls = _counting()
+    read_file(source_file)
+    for name in os.listdir(cache_dir):
+        with open(os.path.join(cache_dir, name), 'w', encoding='utf-8') as f:
+            f.write("{not json")
+
+    assert read_file(source_file) == "original"
+    assert read_file(source_file) == "original"
+    assert len(calls) == 2
+
+
+def test_unserializable_result_not_stored(cache_dir, source_file):
+    """Test a result JSON can't hold is returned but leaves nothing on disk"""
+    read_file, calls = _counting(result={"values": {1, 2}})
+    assert read_file(source_file) == {"values": {1, 2}}
+    assert read_file(source_file) == {"values": {1, 2}}
+    assert len(calls) == 2
+    assert os.listdir(cache_dir) == []
+
+
+def test_entries(cache_dir):
+    """Test load_entry/store_entry round-trip under arbitrary keys"""
+    assert load_entry(["gemini", "prompt"]) is None
+    store_entry(["gemini", "prompt"], {"answer": 42})
+    assert load_entry(["gemini", "prompt"]) == {"answer": 42}
+    assert load_entry(["gemini", "other prompt"]) is None
+
+
+def test_document_entries_ignore_worker_count(cache_dir, source_file):
+    """Test batch (max_workers=1) and single calls share one document entry"""
+    first = extract_document_content(source_file, max_workers=1)
+    assert extract_document_content(source_file) == first
+    assert len(os.listdir(cache_dir)) == 1
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
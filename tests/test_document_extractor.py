@@ -0,0 +1,99 @@
+"""
+Test document extraction, including the concurrent batch path
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tools import document_extractor
+from tools.document_extractor import (
+    PARALLEL_PDF_MIN_PAGES, extract_document_content, extract_documents_sync
+)
+
+
+def _write_pdf(path: str, page_texts) -> None:
+    """Write a minimal PDF with one line of Helvetica text per page"""
+    page_count = len(page_texts)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            b" ".join(b"%d 0 R" % (4 + 2 * i) for i in range(page_count)), page_count),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(page_texts):
+        stream = b"BT /F1 12 Tf 72 720 Td (%s) Tj ET" % text.encode('latin-1')
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (5 + 2 * i))
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+
+    with open(path, 'wb') as f:
+        f.write(bytes(out))
+
+
+@pytest.fixture
+def documents(tmp_path):
+    """Small and large PDFs mixed with a TXT file"""
+    paths = []
+    for doc_idx, page_count in enumerate((2, 3, PARALLEL_PDF_MIN_PAGES + 4, 1)):
+        path = str(tmp_path / f"doc{doc_idx}.pdf")
+        _write_pdf(path, [f"Document {doc_idx} page {page}" for page in range(page_count)])
+        paths.append(path)
+
+    txt_path = tmp_path / "notes.txt"
+    txt_path.write_text("plain text notes\nsecond line", encoding='utf-8')
+    paths.insert(2, str(txt_path))
+    return paths
+
+
+def test_extract_pdf(documents):
+    """Test extracting every page of a single PDF"""
+    result = extract_document_content(documents[0], max_workers=1)
+    assert result["file_type"] == "pdf"
+    assert result["page_count"] == 2
+    assert "Document 0 page 0" in result["full_text"]
+    assert "Document 0 page 1" in result["full_text"]
+    assert result["word_count"] == 8
+
+
+def test_extract_pdf_parallel(tmp_path):
+    """Test the process-pool path gives the same result as a single process"""
+    path = str(tmp_path / "long.pdf")
+    _write_pdf(path, [f"Long document page {page}" for page in range(PARALLEL_PDF_MIN_PAGES + 4)])
+
+    assert extract_document_content(path, max_workers=2) == extract_document_content(path, max_workers=1)
+
+
+def test_extract_documents_batch(documents, monkeypatch):
+    """Test that the batch path matches one-by-one extraction without process pools"""
+    expected = [extract_document_content(path, max_workers=1) for path in documents]
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("batch extraction must not start a process pool")
+
+    # Large PDFs would use several processes when extracted on their own
+    monkeypatch.setattr(document_extractor.os, "cpu_count", lambda: 4)
+    monkeypatch.setattr(document_extractor, "ProcessPoolExecutor", no_pool)
+    results = extract_documents_sync(documents, max_concurrency=8)
+
+    assert results == expected
+    assert results[3]["pages_processed"] == PARALLEL_PDF_MIN_PAGES + 4
+    assert results[2]["file_type"] == "txt"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,158 @@
+"""
+Test the XML-level design extractor against python-pptx
+"""
+
+import os
+import sys
+
+import pytest
+from pptx import Presentation
+from pptx.chart.data import CategoryChartData
+from pptx.dml.color import RGBColor
+from pptx.enum.chart import XL_CHART_TYPE
+from pptx.enum.dml import MSO_COLOR_TYPE, MSO_FILL
+from pptx.enum.shapes import MSO_CONNECTOR, MSO_SHAPE
+from pptx.util import Inches, Pt
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tools.extract_template_design import SAMPLE_SLIDE_COUNT, extract_template_design
+
+
+def _rgb(color_format):
+    """Explicit RGB of a color, or None for theme/unset colors"""
+    if color_format.type == MSO_COLOR_TYPE.RGB:
+        return str(color_format.rgb)
+    return None
+
+
+def _design_with_python_pptx(template_path):
+    """The same report built through python-pptx's object model"""
+    prs = Presentation(template_path)
+
+    design_info = {
+        "slide_count": len(prs.slides),
+        "layout_count": len(prs.slide_layouts),
+        "slide_width": prs.slide_width,
+        "slide_height": prs.slide_height,
+        "layouts": [],
+        "sample_slides": []
+    }
+
+    for i, layout in enumerate(prs.slide_layouts):
+        design_info["layouts"].append({
+            "index": i,
+            "name": layout.name,
+            "placeholders": [{
+                "type": shape.placeholder_format.type,
+                "idx": shape.placeholder_format.idx,
+                "name": shape.name,
+                "left": shape.left,
+                "top": shape.top,
+                "width": shape.width,
+                "height": shape.height
+            } for shape in layout.placeholders]
+        })
+
+    for i, slide in enumerate(list(prs.slides)[:SAMPLE_SLIDE_COUNT]):
+        slide_info = {"slide_number": i + 1, "shapes": []}
+
+        for shape in slide.shapes:
+            shape_info = {
+                "name": shape.name,
+                "type": str(shape.shape_type),
+                "left": shape.left,
+                "top": shape.top,
+                "width": shape.width,
+                "height": shape.height
+            }
+
+            if hasattr(shape, "text_frame"):
+                shape_info["has_text"] = True
+                shape_info["text"] = shape.text[:100] if shape.text else ""
+
+                para = shape.text_frame.paragraphs[0]
+                if para.runs:
+                    font = para.runs[0].font
+                    font_info = {"name": font.name, "size": font.size, "bold": font.bold, "italic": font.italic}
+                    if _rgb(font.color):
+                        font_info["color_rgb"] = _rgb(font.color)
+                    shape_info["font"] = font_info
+
+            if hasattr(shape, "fill") and shape.fill.type == MSO_FILL.SOLID and _rgb(shape.fill.fore_color):
+                shape_info["fill_color_rgb"] = _rgb(shape.fill.fore_color)
+
+            slide_info["shapes"].append(shape_info)
+
+        design_info["sample_slides"].append(slide_info)
+
+    return design_info
+
+
+@pytest.fixture(scope="module")
+def generated_deck(tmp_path_factory) -> str:
+    """Deck with every layout and a mix of shape kinds on the sampled slides"""
+    prs = Presentation()
+
+    for layout_idx, layout in enumerate(prs.slide_layouts):
+        slide = prs.slides.add_slide(layout)
+
+        # Placeholders keep no position of their own: inherited from the layout
+        for ph in slide.placeholders:
+            if ph.has_text_frame:
+                ph.text_frame.text = f"Placeholder {layout_idx}\nsecond paragraph"
+                run = ph.text_frame.paragraphs[0].runs[0]
+                run.font.size = Pt(20.5)
+                run.font.bold = True
+                run.font.name = "Arial"
+                run.font.color.rgb = RGBColor(0x12, 0xAB, 0xCD)
+
+        if layout_idx >= SAMPLE_SLIDE_COUNT:
+            continue
+
+        textbox = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(2), Inches(1))
+        textbox.text_frame.text = "Text box\vwith a line break"
+
+        autoshape = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, Inches(1), Inches(2), Inches(1), Inches(1))
+        autoshape.fill.solid()
+        autoshape.fill.fore_color.rgb = RGBColor(1, 2, 3)
+        autoshape.text_frame.text = "Theme colored"
+        autoshape.text_frame.paragraphs[0].runs[0].font.color.theme_color = 5
+
+        slide.shapes.add_connector(MSO_CONNECTOR.STRAIGHT, 0, 0, Inches(1), Inches(1))
+
+        group = slide.shapes.add_group_shape()
+        group.shapes.add_shape(MSO_SHAPE.OVAL, Inches(3), Inches(3), Inches(1), Inches(1))
+        group.shapes.add_textbox(Inches(4), Inches(3), Inches(1), Inches(1)).text_frame.text = "grouped"
+
+        table = slide.shapes.add_table(2, 2, Inches(5), Inches(1), Inches(3), Inches(1)).table
+        table.cell(0, 0).text = "cell"
+
+        chart_data = CategoryChartData()
+        chart_data.categories = ["A", "B"]
+        chart_data.add_series("Series", (1, 2))
+        slide.shapes.add_chart(XL_CHART_TYPE.COLUMN_CLUSTERED, Inches(5), Inches(3),
+                               Inches(3), Inches(2), chart_data)
+
+    path = str(tmp_path_factory.mktemp("decks") / "generated.pptx")
+    prs.save(path)
+    return path
+
+
+def test_matches_python_pptx_on_template(template_path):
+    """Test the bundled template gives the same report as python-pptx"""
+    assert extract_template_design(template_path) == _design_with_python_pptx(template_path)
+
+
+def test_matches_python_pptx_on_generated_deck(generated_deck):
+    """Test text boxes, groups, tables, charts, connectors and inherited placeholders"""
+    design = extract_template_design(generated_deck)
+    assert design == _design_with_python_pptx(generated_deck)
+
+    shape_types = {shape["type"] for slide in design["sample_slides"] for shape in slide["shapes"]}
+    assert {"TEXT_BOX (17)", "GROUP (6)", "TABLE (19)", "CHART (3)", "LINE (9)", "PLACEHOLDER (14)"} <= shape_types
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -3,88 +3,82 @@ Test Module 1: Template Management System
 Tests template analysis and function generation
 """
 
-import sys
 import os
+import sys
+import json
+import importlib.util
+
+import pytest
 
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from tools.template_analyzer import analyze_ppt_template, generate_template_functions
+from tools.template_analyzer import generate_template_functions
 
 
-def test_template_analysis():
+def test_template_analysis(template_metadata):
     """Test analyzing the presentation template"""
-    template_path = "presentation-template.pptx"
-
-    if not os.path.exists(template_path):
-        print(f"[FAIL] Template file not found: {template_path}")
-        return False
-
-    print("=" * 70)
-    print("MODULE 1 TEST: Template Analysis & Function Generation")
-    print("=" * 70)
-
-    # Test 1: Analyze template
-    print("\n[Test 1] Analyzing template...")
-    try:
-        metadata = analyze_ppt_template(template_path)
-        print(f"[PASS] Template analyzed successfully")
-        print(f"   Template ID: {metadata['template_id']}")
-        print(f"   Template Name: {metadata['template_name']}")
-        print(f"   Slide Dimensions: {metadata['slide_width_inches']}\" x {metadata['slide_height_inches']}\"")
-        print(f"   Layouts Found: {len(metadata['layouts'])}")
-
-        print(f"\n   Layout Details:")
-        for layout in metadata['layouts']:
-            print(f"     - Layout {layout['layout_index']}: {layout['layout_name']}")
-            print(f"       Placeholders: {len(layout['slots'])}")
-            for slot_name, slot_info in layout['slots'].items():
-                print(f"         * {slot_name} ({slot_info['placeholder_type']})")
-
-    except Exception as e:
-        print(f"[FAIL] Template analysis failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-    # Test 2: Generate functions
-    print("\n[Test 2] Generating template functions...")
-    try:
-        func_path = generate_template_functions(metadata, output_dir="templates")
-        print(f"[PASS] Functions generated successfully")
-        print(f"   Functions file: {func_path}")
-
-        # Check if file exists and has content
-        if os.path.exists(func_path):
-            with open(func_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                print(f"   Lines of code: {len(lines)}")
-        else:
-            print(f"[FAIL] Functions file not created")
-            return False
-
-    except Exception as e:
-        print(f"[FAIL] Function generation failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-    # Test 3: Verify metadata JSON was saved
-    print("\n[Test 3] Verifying metadata JSON...")
-    metadata_path = os.path.join("templates", f"{metadata['template_id']}_metadata.json")
-    if os.path.exists(metadata_path):
-        print(f"[PASS] Metadata JSON saved: {metadata_path}")
-    else:
-        print(f"[FAIL] Metadata JSON not found")
-        return False
-
-    print("\n" + "=" * 70)
-    print("[PASS] MODULE 1 TEST: ALL TESTS PASSED")
-    print("=" * 70)
-
-    return True
+    assert template_metadata['template_id'].startswith("presentation_template_")
+    assert template_metadata['template_name'] == "presentation-template.pptx"
+    assert template_metadata['slide_width_inches'] > 0
+    assert template_metadata['slide_height_inches'] > 0
+    assert template_metadata['layouts']
+
+    for layout in template_metadata['layouts']:
+        assert layout['layout_id'] == f"layout_{layout['layout_index']}"
+        for slot_name, slot_info in layout['slots'].items():
+            assert slot_info['name'] == slot_name
+            assert set(slot_info['position']) == {"left_inches", "top_inches", "width_inches", "height_inches"}
+
+
+def test_generate_template_functions(generated_functions_path):
+    """Test that the generated functions file exists and is valid Python"""
+    assert os.path.exists(generated_functions_path)
+
+    with open(generated_functions_path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    compile(source, generated_functions_path, 'exec')
+
+
+def test_metadata_file(template_metadata, generated_functions_path):
+    """Test that the metadata JSON was saved next to the functions file"""
+    metadata_path = os.path.join(os.path.dirname(generated_functions_path),
+                                 f"{template_metadata['template_id']}_metadata.json")
+    assert os.path.exists(metadata_path)
+
+    with open(metadata_path, 'r', encoding='utf-8') as f:
+        assert json.load(f) == template_metadata
+
+
+def test_generation_skipped_when_unchanged(template_metadata, tmp_path):
+    """Test that regenerating identical metadata leaves the files untouched"""
+    func_path = generate_template_functions(template_metadata, output_dir=str(tmp_path))
+    mtime_ns = os.stat(func_path).st_mtime_ns
+
+    assert generate_template_functions(template_metadata, output_dir=str(tmp_path)) == func_path
+    assert os.stat(func_path).st_mtime_ns == mtime_ns
+
+
+def test_generated_class_usage(template_path, template_metadata, generated_functions_path, tmp_path):
+    """Test building and saving a deck with the generated template class"""
+    spec = importlib.util.spec_from_file_location("generated_template", generated_functions_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    template = module.PresentationTemplateTemplate(template_path)
+    assert template.get_slide_count() == 0
+
+    template.add_title_slide("Title", "Subtitle")
+    template.add_content_slide("Agenda", ["First point", "Second & <third>"])
+    template.add_section_header_slide("Section")
+    template.add_image_placeholder_slide("Image", "A prompt", context="Why")
+    template.add_two_column_slide("Compare", ["Left"], ["Right"])
+    assert template.get_slide_count() == 5
+    assert template.template_metadata == template_metadata
+
+    output_path = template.save(str(tmp_path / "generated.pptx"))
+    assert os.path.exists(output_path)
 
 
 if __name__ == "__main__":
-    success = test_template_analysis()
-    sys.exit(0 if success else 1)
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,332 @@
+"""
+Test the AI template analyzer's offline parts (no Gemini calls)
+"""
+
+import os
+import sys
+import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+from pptx import Presentation
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+pytest.importorskip("google.generativeai")
+
+from tools import template_analyzer_v2
+from tools.template_analyzer_v2 import (
+    MAX_ATTEMPTS, MAX_PROMPT_SHAPES, _configured_model, _extract_shape_features, _init_genai, _parse_slide_response,
+    _validate_slide_result, analyze_ppt_template_with_ai, analyze_ppt_template_with_ai_async,
+    analyze_slide_with_gemini
+)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SHAPE_FEATURES_DECK = os.path.join(FIXTURES_DIR, "shape_features.pptx")
+
+
+@pytest.fixture(scope="module")
+def shape_features():
+    """Features of the single slide in the shape features fixture"""
+    prs = Presentation(SHAPE_FEATURES_DECK)
+    return _extract_shape_features(prs.slides[0])
+
+
+def test_placeholder_position_inherited(shape_features):
+    """Test a placeholder without its own transform takes the layout's position"""
+    title = shape_features["shapes"][0]
+    assert title["type"] == "PLACEHOLDER (14)"
+    assert (title["left_inches"], title["top_inches"], title["width_inches"], title["height_inches"]) == (0.5, 0.3, 9.0, 1.25)
+
+
+def test_run_without_properties(shape_features):
+    """Test a first run with no <a:rPr> reports no size or color"""
+    shape = shape_features["shapes"][1]
+    assert shape["sample_text"] == "No run properties"
+    assert shape["font_bold"] is None
+    assert "font_size_pt" not in shape
+    assert "font_color_rgb" not in shape
+
+
+def test_theme_color_and_half_point_sizes(shape_features):
+    """Test theme colors are left out and half-point sizes round like round(emu / 12700)"""
+    theme_text, rgb_text = shape_features["shapes"][2:4]
+
+    assert theme_text["font_size_pt"] == 10  # 10.5pt
+    assert theme_text["font_bold"] is True
+    assert "font_color_rgb" not in theme_text
+
+    assert rgb_text["font_size_pt"] == 12  # 11.5pt
+    assert rgb_text["font_bold"] is False
+    assert rgb_text["font_color_rgb"] == "RGBColor(18, 171, 205)"
+
+
+def test_fill_colors(shape_features):
+    """Test only explicit RGB fills are reported"""
+    rgb_fill, theme_fill = shape_features["shapes"][4:6]
+    assert rgb_fill["fill_color_rgb"] == "RGBColor(1, 2, 3)"
+    assert rgb_fill["has_text"] is False
+    assert "fill_color_rgb" not in theme_fill
+
+
+def test_text_content(shape_features):
+    """Test text samples are collected in shape order"""
+    assert shape_features["text_content"] == [
+        "Inherited title", "No run properties", "Theme colored text", "Explicit RGB text"
+    ]
+
+
+def _slide_answer(**analysis_overrides):
+    """A well-formed Gemini answer for one slide"""
+    analysis = {
+        "slide_type": "title",
+        "usage_description": "Opening slide",
+        "key_features": ["Large title"],
+        "recommended_content": "Deck title",
+        "function_name": "add_title_slide"
+    }
+    analysis.update(analysis_overrides)
+    return {
+        "analysis": analysis,
+        "function_code": f"def {analysis['function_name']}(self, title: str = \"\") -> None:\n    pass\n"
+    }
+
+
+class FakeModel:
+    """Stands in for genai.GenerativeModel, replying from a script"""
+
+    def __init__(self, *replies):
+        # Each reply is response text, a function of the prompt returning it,
+        # or an exception to raise; the last one repeats
+        self.replies = list(replies)
+        self.prompts = []
+
+    async def generate_content_async(self, prompt):
+        self.prompts.append(prompt)
+        reply = self.replies.pop(0) if len(self.replies) > 1 else self.replies[0]
+        if isinstance(reply, Exception):
+            raise reply
+        if callable(reply):
+            reply = reply(prompt)
+
+        class Response:
+            text = reply
+        return Response()
+
+
+@pytest.fixture
+def answer_cache(monkeypatch):
+    """Empty in-memory stand-in for the prompt-keyed answer cache"""
+    entries = {}
+    monkeypatch.setattr(template_analyzer_v2, "load_entry", lambda key: entries.get(json.dumps(key)))
+    monkeypatch.setattr(template_analyzer_v2, "store_entry",
+                        lambda key, result: entries.__setitem__(json.dumps(key), result))
+    return entries
+
+
+@pytest.fixture
+def backoff_waits(monkeypatch):
+    """Seconds _generate_with_retry asked to sleep, without sleeping"""
+    waits = []
+
+    async def no_sleep(seconds):
+        waits.append(seconds)
+
+    monkeypatch.setattr(template_analyzer_v2.asyncio, "sleep", no_sleep)
+    return waits
+
+
+def _analyze(model, slide_index=0):
+    """Run analyze_slide_with_gemini on an empty slide"""
+    return asyncio.run(analyze_slide_with_gemini({"shapes": [], "text_content": []}, slide_index, model))
+
+
+def test_parse_slide_response_ignores_surrounding_text():
+    """Test fences and chatty text around the JSON object are skipped"""
+    answer = _slide_answer()
+    text = "Here you go:\n```json\n" + json.dumps(answer) + "\n```\nEnjoy!"
+    result = _parse_slide_response(text)
+    assert result["analysis"] == answer["analysis"]
+    assert result["function_code"] == answer["function_code"].strip()
+
+
+@pytest.mark.parametrize("answer", [
+    {"analysis": {}},
+    _slide_answer(key_features=["ok", 3]),
+    _slide_answer(function_name="class"),
+    _slide_answer(function_name="add slide"),
+    dict(_slide_answer(), function_code="def something_else(self):\n    pass"),
+])
+def test_validate_slide_result_rejects_malformed(answer):
+    """Test missing fields, bad names and mismatched code are rejected"""
+    with pytest.raises(ValueError):
+        _validate_slide_result(answer)
+
+
+def test_malformed_cache_entry_is_a_miss(monkeypatch):
+    """Test a cached answer failing validation is asked for again"""
+    stale = _slide_answer()
+    del stale["analysis"]["usage_description"]
+    monkeypatch.setattr(template_analyzer_v2, "load_entry", lambda key: stale)
+    monkeypatch.setattr(template_analyzer_v2, "store_entry", lambda key, result: None)
+
+    result = _analyze(FakeModel(json.dumps(_slide_answer())))
+    assert result["analysis"]["usage_description"] == "Opening slide"
+
+
+def _prompt_shapes(prompt):
+    """Shape details a prompt describes"""
+    shapes_json = prompt.split("Shape details")[1].split(":\n", 1)[1]
+    return json.loads(shapes_json.rsplit("\n\nReturn ONLY", 1)[0])
+
+
+def _shape(idx, width):
+    """Minimal shape details, told apart by their left edge"""
+    return {"type": "AUTO_SHAPE (1)", "left_inches": float(idx), "top_inches": 0.0,
+            "width_inches": width, "height_inches": 1.0, "has_text": False}
+
+
+def test_prompt_keeps_shape_order(answer_cache):
+    """Test shapes under the budget are described as they are, in document order"""
+    shapes = [_shape(idx, width) for idx, width in enumerate((1.0, 5.0, 2.0))]
+    model = FakeModel(json.dumps(_slide_answer()))
+    asyncio.run(analyze_slide_with_gemini({"shapes": shapes, "text_content": []}, 0, model))
+
+    assert _prompt_shapes(model.prompts[0]) == shapes
+    assert "omitted" not in model.prompts[0]
+
+
+def test_prompt_drops_smallest_shapes(answer_cache):
+    """Test busy slides keep their largest shapes, in document order, and say how many were left out"""
+    widths = [float((idx * 7) % 25 + 1) for idx in range(MAX_PROMPT_SHAPES + 5)]
+    shapes = [_shape(idx, width) for idx, width in enumerate(widths)]
+    model = FakeModel(json.dumps(_slide_answer()))
+    asyncio.run(analyze_slide_with_gemini({"shapes": shapes, "text_content": []}, 0, model))
+
+    prompt = model.prompts[0]
+    assert f"Number of shapes: {len(shapes)}" in prompt
+    assert "Shape details (5 smaller shapes omitted):" in prompt
+    assert _prompt_shapes(prompt) == [shape for shape in shapes if shape["width_inches"] > 5]
+
+
+def test_answers_cached_by_prompt(answer_cache, backoff_waits):
+    """Test a repeated prompt is answered from the cache"""
+    model = FakeModel(json.dumps(_slide_answer()))
+    first = _analyze(model)
+    assert _analyze(model) == first
+    assert len(model.prompts) == 1
+    assert len(answer_cache) == 1
+
+
+def test_rate_limit_retried(answer_cache, backoff_waits):
+    """Test ResourceExhausted is retried with backoff and the answer is kept"""
+    model = FakeModel(google_exceptions.ResourceExhausted("quota"), json.dumps(_slide_answer()))
+    result = _analyze(model)
+
+    assert result["analysis"]["function_name"] == "add_title_slide"
+    assert len(model.prompts) == 2
+    assert backoff_waits == [2]
+    assert list(answer_cache.values()) == [result]
+
+
+def test_non_retryable_error_falls_back(answer_cache, backoff_waits):
+    """Test other errors go straight to the fallback, which isn't cached"""
+    model = FakeModel(google_exceptions.InvalidArgument("bad request"))
+    result = _analyze(model, slide_index=3)
+
+    assert result["analysis"]["function_name"] == "add_slide_3"
+    assert len(model.prompts) == 1
+    assert backoff_waits == []
+    assert answer_cache == {}
+
+
+def test_gives_up_after_max_attempts(answer_cache, backoff_waits):
+    """Test persistent rate limiting ends in the fallback after MAX_ATTEMPTS"""
+    model = FakeModel(google_exceptions.ResourceExhausted("quota"))
+    result = _analyze(model)
+
+    assert result["analysis"]["function_name"] == "add_slide_0"
+    assert len(model.prompts) == MAX_ATTEMPTS
+    assert backoff_waits == [2 ** attempt for attempt in range(1, MAX_ATTEMPTS)]
+    assert answer_cache == {}
+
+
+
+@pytest.fixture
+def fake_gemini(monkeypatch, answer_cache):
+    """Template analysis wired to a FakeModel instead of Gemini"""
+    model = FakeModel(json.dumps(_slide_answer()))
+    monkeypatch.setenv("GOOGLE_AI_STUDIO_KEY", "test-key")
+    monkeypatch.setattr(template_analyzer_v2, "_init_genai", lambda api_key: None)
+    monkeypatch.setattr(template_analyzer_v2, "_configured_model", lambda: model)
+    return model
+
+
+def test_repeated_layouts_analyzed_once(fake_gemini, tmp_path):
+    """Test one request per distinct layout, with reused functions renamed"""
+    prs = Presentation()
+    for idx in range(4):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"Content {idx}"
+        slide.placeholders[1].text = f"Point {idx}"
+    prs.slides.add_slide(prs.slide_layouts[5]).shapes.title.text = "Title only"
+    deck_path = str(tmp_path / "repeated.pptx")
+    prs.save(deck_path)
+
+    def answer(prompt):
+        slide_index = prompt.split("Slide Index: ")[1].split("\n")[0]
+        return json.dumps(_slide_answer(function_name=f"add_layout_{slide_index}"))
+
+    fake_gemini.replies = [answer]
+    metadata = asyncio.run(analyze_ppt_template_with_ai_async(deck_path))
+
+    assert len(fake_gemini.prompts) == 2
+    names = [slide["function_name"] for slide in metadata["analyzed_slides"]]
+    assert names == ["add_layout_0", "add_layout_0_1", "add_layout_0_2", "add_layout_0_3", "add_layout_4"]
+    for name, function in zip(names, metadata["_generated_function_codes"]):
+        assert function["function_name"] == name
+        assert function["code"].startswith(f"def {name}(")
+
+
+def test_analyze_template_async(fake_gemini):
+    """Test the async entry point works inside a caller's event loop"""
+    metadata = asyncio.run(analyze_ppt_template_with_ai_async(SHAPE_FEATURES_DECK))
+    assert metadata["analyzed_slides"][0]["function_name"] == "add_title_slide"
+    assert len(fake_gemini.prompts) == 1
+
+
+def test_analyze_template_sync_from_threads(fake_gemini):
+    """Test the blocking wrapper works from several threads at once"""
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: analyze_ppt_template_with_ai(SHAPE_FEATURES_DECK), range(4)))
+    assert all(metadata == results[0] for metadata in results)
+
+
+def test_analyze_template_sync_inside_event_loop(fake_gemini):
+    """Test the blocking wrapper points async callers at the async entry point"""
+    async def call_blocking():
+        return analyze_ppt_template_with_ai(SHAPE_FEATURES_DECK)
+
+    with pytest.raises(RuntimeError, match="analyze_ppt_template_with_ai_async"):
+        asyncio.run(call_blocking())
+
+
+def test_models_per_event_loop():
+    """Test each event loop gets its own model and gRPC client"""
+    _init_genai("test-key")
+
+    async def two_lookups():
+        return _configured_model(), _configured_model()
+
+    first, again = asyncio.run(two_lookups())
+    other, _ = asyncio.run(two_lookups())
+    assert first is again
+    assert other is not first
+    assert other._async_client is not first._async_client
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -3,10 +3,12 @@ Custom Tools for PPT Generator
 """
 
 from .template_analyzer import analyze_ppt_template, generate_template_functions
-from .document_extractor import extract_document_content
+from .document_extractor import extract_document_content, extract_documents, extract_documents_sync
 
 __all__ = [
     'analyze_ppt_template',
     'generate_template_functions',
-    'extract_document_content'
+    'extract_document_content',
+    'extract_documents',
+    'extract_documents_sync'
 ]
@@ -0,0 +1,90 @@
+"""
+Placeholder scan for slide layouts
+
+Hot loop of analyze_ppt_template (plus the EMU conversion shared with
+template_analyzer_v2), kept free of python-pptx proxies and fully
+annotated so it can be compiled to a C extension with mypyc
+(`mypyc tools/_layout_scan.py`). Python imports the compiled build when one
+sits next to this file and falls back to this source otherwise.
+"""
+
+from typing import Any, Callable, Dict, Final, List, Optional, Sequence
+from lxml import etree  # type: ignore[import-untyped]
+from pptx.enum.shapes import PP_PLACEHOLDER  # type: ignore[import-untyped]
+
+
+NSMAP: Final = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+}
+
+# Top-level placeholder shapes of a slide layout, in document order
+PH_SHAPE_XPATH: Final = etree.XPath("p:cSld/p:spTree/*[*/p:nvPr/p:ph]", namespaces=NSMAP)
+PH_XPATH: Final = etree.XPath("*/p:nvPr/p:ph", namespaces=NSMAP)
+NAME_XPATH: Final = etree.XPath("*/p:cNvPr/@name", namespaces=NSMAP, smart_strings=False)
+# <a:off> and <a:ext> of an autoshape's own transform, in that order
+OFF_EXT_XPATH: Final = etree.XPath("p:spPr/a:xfrm/a:off | p:spPr/a:xfrm/a:ext", namespaces=NSMAP)
+
+SP_TAG: Final = "{%s}sp" % NSMAP["p"]
+EMU_PER_INCH: Final = 914400
+
+
+def emu_to_inches(emu: int) -> float:
+    """EMU to inches rounded half-up to 2 decimals, in integer arithmetic"""
+    return (emu * 100 + EMU_PER_INCH // 2) // EMU_PER_INCH / 100
+
+
+def emus_to_inches(emus: Sequence[Optional[int]]) -> List[Optional[float]]:
+    """emu_to_inches over a shape's [left, top, width, height]; missing values stay None"""
+    return [emu_to_inches(emu) if emu is not None else None for emu in emus]
+
+
+def scan_layout_placeholders(layout_element: Any,
+                             resolve_emus: Callable[[Any], List[int]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Extract slot metadata for every placeholder on a slide layout
+
+    Args:
+        layout_element: The layout's <p:sldLayout> element
+        resolve_emus: Returns [left, top, width, height] in EMU for a
+            placeholder without a local transform (inherited position)
+
+    Returns:
+        Slot metadata keyed by placeholder name
+    """
+    slots: Dict[str, Dict[str, Any]] = {}
+
+    for ph_shape in PH_SHAPE_XPATH(layout_element):
+        ph = PH_XPATH(ph_shape)[0]
+        name: str = NAME_XPATH(ph_shape)[0]
+        off_ext = OFF_EXT_XPATH(ph_shape)
+
+        emus: List[int]
+        if len(off_ext) == 2:
+            off, ext = off_ext
+            emus = [int(off.get("x")), int(off.get("y")), int(ext.get("cx")), int(ext.get("cy"))]
+        else:
+            # No local xfrm (inherited from the master) or not a plain
+            # autoshape; let the caller resolve the position
+            emus = resolve_emus(ph_shape)
+
+        left, top, width, height = [emu_to_inches(emu) for emu in emus]
+        slot_info: Dict[str, Any] = {
+            "placeholder_type": str(PP_PLACEHOLDER.from_xml(ph.get("type", "obj"))),
+            "placeholder_idx": int(ph.get("idx", "0")),
+            "name": name,
+            "position": {
+                "left_inches": left,
+                "top_inches": top,
+                "width_inches": width,
+                "height_inches": height
+            }
+        }
+
+        # Autoshapes always have a text frame; pictures and frames don't
+        if ph_shape.tag == SP_TAG:
+            slot_info["has_text_frame"] = True
+
+        slots[name] = slot_info
+
+    return slots
@@ -0,0 +1,147 @@
+"""
+On-disk Result Cache
+Persists JSON results of file-processing tools across runs
+
+Entries live under ~/.cache/prezo (or $XDG_CACHE_HOME/prezo) and are never
+evicted: results such as full document texts accumulate until the directory
+is deleted. Set PREZO_DISK_CACHE=0 to turn the cache off.
+"""
+
+import os
+import json
+import hashlib
+import functools
+import inspect
+import tempfile
+from typing import Any, Callable, Iterable, Optional
+
+
+# Bump when the cache file format changes so every stale entry is ignored;
+# for changes to one function's results, bump its disk_cached(version=...)
+CACHE_VERSION = 1
+
+CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')),
+    'prezo'
+)
+
+
+def _cache_enabled() -> bool:
+    """Caching is on unless PREZO_DISK_CACHE=0"""
+    return os.environ.get('PREZO_DISK_CACHE', '1') != '0'
+
+
+def disk_cached(func: Optional[Callable[..., Any]] = None, *, version: Any = 1,
+                ignore: Iterable[str] = ()) -> Any:
+    """
+    Cache a function's JSON-serializable result on disk
+
+    The wrapped function must take a file path as its first argument. Entries
+    are keyed by that path, its mtime and size, the remaining arguments (with
+    defaults filled in, however they were passed) and the version, so editing
+    the file invalidates its entry. Use as @disk_cached, or
+    @disk_cached(version=N) and bump N whenever the function's results change
+    for the same input.
+
+    Args:
+        func: Function to wrap
+        version: Version of the function's result format; anything else the
+            result depends on besides the arguments (e.g. which library
+            produced it) belongs here too
+        ignore: Names of arguments that don't affect the result, left out of
+            the key
+
+    Returns:
+        Wrapped function that reads from / writes to the cache
+    """
+    if func is None:
+        return functools.partial(disk_cached, version=version, ignore=ignore)
+
+    signature = inspect.signature(func)
+    ignored = frozenset(ignore)
+
+    @functools.wraps(func)
+    def wrapper(file_path: str, *args, **kwargs):
+        if not _cache_enabled() or not os.path.exists(file_path):
+            return func(file_path, *args, **kwargs)
+
+        bound = signature.bind(file_path, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = [(name, value) for name, value in list(bound.arguments.items())[1:] if name not in ignored]
+
+        stat = os.stat(file_path)
+        cache_path = _entry_path([
+            func.__module__, func.__qualname__, version,
+            os.path.abspath(file_path), file_path, stat.st_mtime_ns, stat.st_size,
+            arguments
+        ])
+
+        result = _load(cache_path)
+        if result is None:
+            result = func(file_path, *args, **kwargs)
+            _store(cache_path, result)
+        return result
+
+    return wrapper
+
+
+def load_entry(key: Any) -> Any:
+    """
+    Read a result cached under an arbitrary JSON-serializable key
+
+    Args:
+        key: Cache key, e.g. a list of the inputs the result depends on
+
+    Returns:
+        The cached result, or None on a miss or when caching is disabled
+    """
+    if not _cache_enabled():
+        return None
+    return _load(_entry_path(key))
+
+
+def store_entry(key: Any, result: Any) -> None:
+    """
+    Cache a JSON-serializable result under an arbitrary key
+
+    Args:
+        key: Cache key, as passed to load_entry
+        result: Value to cache
+    """
+    if _cache_enabled():
+        _store(_entry_path(key), result)
+
+
+def _entry_path(key: Any) -> str:
+    """Cache file for a key"""
+    key_json = json.dumps([CACHE_VERSION, key], default=str)
+    return os.path.join(CACHE_DIR, hashlib.blake2b(key_json.encode('utf-8'), digest_size=16).hexdigest() + '.json')
+
+
+def _load(cache_path: str) -> Any:
+    """Read a cache entry; a missing or corrupt one is a miss (None)"""
+    try:
+        with open(cache_path, 'rb') as f:
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _store(cache_path: str, result: Any) -> None:
+    """Write a cache entry atomically; a cache that can't be written is skipped"""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+    except OSError:
+        return
+
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        # TypeError/ValueError: result isn't JSON-serializable
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
@@ -1,11 +1,294 @@
 """
 Extract design elements from PowerPoint template
+
+Reads the package parts directly with zipfile + lxml instead of building a
+python-pptx Presentation: only the first slide master, its layouts and the
+sample slides are parsed, and only the fields reported below are read.
 """
 
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.enum.text import PP_ALIGN
 import json
+import posixpath
+import zipfile
+from typing import Any, Dict, List, Optional
+from lxml import etree
+from pptx.enum.shapes import MSO_SHAPE_TYPE, PP_PLACEHOLDER
+
+
+SAMPLE_SLIDE_COUNT = 3
+
+_NSMAP = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "pr": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+_RT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/"
+_RT_OFFICE_DOCUMENT = _RT + "officeDocument"
+_RT_SLIDE_LAYOUT = _RT + "slideLayout"
+_RT_SLIDE_MASTER = _RT + "slideMaster"
+
+_GRAPHIC_DATA_URI_CHART = "http://schemas.openxmlformats.org/drawingml/2006/chart"
+_GRAPHIC_DATA_URI_TABLE = "http://schemas.openxmlformats.org/drawingml/2006/table"
+_GRAPHIC_DATA_URI_OLEOBJ = "http://schemas.openxmlformats.org/presentationml/2006/ole"
+
+
+def _qn(tag: str) -> str:
+    """'p:sp' -> '{namespace}sp'"""
+    prefix, local = tag.split(":")
+    return "{%s}%s" % (_NSMAP[prefix], local)
+
+
+def _xpath(expr: str, **kwargs) -> etree.XPath:
+    return etree.XPath(expr, namespaces=_NSMAP, smart_strings=False, **kwargs)
+
+
+# Shape elements python-pptx exposes as slide.shapes, in document order
+_SHAPE_TAGS = tuple(_qn(t) for t in ("p:sp", "p:grpSp", "p:graphicFrame", "p:cxnSp", "p:pic", "p:contentPart"))
+_SP_TREE = _qn("p:spTree")
+_SP, _PIC, _GRAPHIC_FRAME = _qn("p:sp"), _qn("p:pic"), _qn("p:graphicFrame")
+_R, _BR, _FLD = _qn("a:r"), _qn("a:br"), _qn("a:fld")
+
+_RELATIONSHIP_XPATH = _xpath("/pr:Relationships/pr:Relationship[not(@TargetMode='External')]")
+_SLD_ID_XPATH = _xpath("/p:presentation/p:sldIdLst/p:sldId/@r:id")
+_SLD_MASTER_ID_XPATH = _xpath("/p:presentation/p:sldMasterIdLst/p:sldMasterId/@r:id")
+_SLD_SZ_XPATH = _xpath("/p:presentation/p:sldSz")
+_SLD_LAYOUT_ID_XPATH = _xpath("/p:sldMaster/p:sldLayoutIdLst/p:sldLayoutId/@r:id")
+_LAYOUT_NAME_XPATH = _xpath("/p:sldLayout/p:cSld/@name")
+_PH_SHAPE_XPATH = _xpath("/*/p:cSld/p:spTree/*[*[1]/p:nvPr/p:ph]")
+_PH_XPATH = _xpath("*[1]/p:nvPr/p:ph")
+_NAME_XPATH = _xpath("*[1]/p:cNvPr/@name")
+# Own transform of sp/cxnSp/pic, graphicFrame and grpSp respectively
+_XFRM_XPATH = _xpath("p:spPr/a:xfrm | p:xfrm | p:grpSpPr/a:xfrm")
+_TX_BOX_XPATH = _xpath("p:nvSpPr/p:cNvSpPr/@txBox")
+_CUST_GEOM_XPATH = _xpath("p:spPr/a:custGeom")
+_PRST_GEOM_XPATH = _xpath("p:spPr/a:prstGeom")
+_VIDEO_FILE_XPATH = _xpath("p:nvPicPr/p:nvPr/a:videoFile")
+_GRAPHIC_DATA_URI_XPATH = _xpath("a:graphic/a:graphicData/@uri")
+_OLE_EMBED_XPATH = _xpath("a:graphic/a:graphicData/p:oleObj/p:embed")
+_PARAGRAPHS_XPATH = _xpath("p:txBody/a:p")
+_FIRST_RUN_PROPS_XPATH = _xpath("a:r[1]/a:rPr")
+_LATIN_TYPEFACE_XPATH = _xpath("a:latin/@typeface")
+_SOLID_FILL_RGB_XPATH = _xpath("a:solidFill/a:srgbClr/@val")
+_SHAPE_FILL_RGB_XPATH = _xpath("p:spPr/a:solidFill/a:srgbClr/@val")
+_TEXT_XPATH = _xpath("a:t/text()")
+
+# Master placeholder a layout placeholder inherits its position from, by type
+_BASE_PH_TYPE = {
+    "body": "body", "chart": "body", "clipArt": "body", "ctrTitle": "title",
+    "dgm": "body", "dt": "dt", "ftr": "ftr", "media": "body", "obj": "body",
+    "pic": "body", "sldNum": "sldNum", "subTitle": "body", "tbl": "body",
+    "title": "title",
+}
+
+_DIMENSIONS = ("left", "top", "width", "height")
+
+
+class _Package:
+    """Read-only access to the XML parts of an open .pptx zip"""
+
+    def __init__(self, zf: zipfile.ZipFile):
+        self._zf = zf
+        self._rels: Dict[str, Dict[str, Any]] = {}
+
+    def parse(self, partname: str):
+        """Parse a whole (small) part such as presentation.xml or a layout"""
+        with self._zf.open(partname) as f:
+            return etree.parse(f)
+
+    def open(self, partname: str):
+        return self._zf.open(partname)
+
+    def rels(self, partname: str) -> Dict[str, Any]:
+        """
+        Relationships of a part
+
+        Returns:
+            {"by_id": {rId: target partname}, "by_type": {reltype: [target partname]}}
+        """
+        if partname not in self._rels:
+            directory, filename = posixpath.split(partname)
+            rels_name = posixpath.join(directory, "_rels", filename + ".rels")
+            by_id: Dict[str, str] = {}
+            by_type: Dict[str, List[str]] = {}
+            if rels_name in self._zf.NameToInfo:
+                for rel in _RELATIONSHIP_XPATH(self.parse(rels_name)):
+                    target = rel.get("Target")
+                    if target.startswith("/"):
+                        target = target[1:]
+                    else:
+                        target = posixpath.normpath(posixpath.join(directory, target))
+                    by_id[rel.get("Id")] = target
+                    by_type.setdefault(rel.get("Type"), []).append(target)
+            self._rels[partname] = {"by_id": by_id, "by_type": by_type}
+        return self._rels[partname]
+
+    def related(self, partname: str, reltype: str) -> Optional[str]:
+        """First target of a part's relationship of the given type"""
+        targets = self.rels(partname)["by_type"].get(reltype)
+        return targets[0] if targets else None
+
+
+def _xfrm_values(shape) -> List[Optional[int]]:
+    """[left, top, width, height] in EMU from a shape's own transform, None where absent"""
+    xfrm = _XFRM_XPATH(shape)
+    if not xfrm:
+        return [None] * 4
+    off, ext = xfrm[0].find(_qn("a:off")), xfrm[0].find(_qn("a:ext"))
+    return [
+        int(off.get("x")) if off is not None else None,
+        int(off.get("y")) if off is not None else None,
+        int(ext.get("cx")) if ext is not None else None,
+        int(ext.get("cy")) if ext is not None else None,
+    ]
+
+
+def _inherit(values: List[Optional[int]], base: Optional[List[Optional[int]]]) -> List[Optional[int]]:
+    """Fill dimensions missing on a placeholder from the one it inherits from"""
+    if base is None:
+        return values
+    return [value if value is not None else base_value for value, base_value in zip(values, base)]
+
+
+def _xsd_bool(value: Optional[str]) -> Optional[bool]:
+    return None if value is None else value in ("1", "true")
+
+
+def _master_positions(master) -> Dict[str, List[Optional[int]]]:
+    """Position of the first master placeholder of each type"""
+    positions: Dict[str, List[Optional[int]]] = {}
+    for shape in _PH_SHAPE_XPATH(master):
+        if shape.tag == _SP:
+            positions.setdefault(_PH_XPATH(shape)[0].get("type", "obj"), _xfrm_values(shape))
+    return positions
+
+
+def _layout_placeholders(layout, master_positions: Dict[str, List[Optional[int]]]) -> List[Dict[str, Any]]:
+    """Placeholders of a slide layout with their effective (inherited) positions"""
+    placeholders = []
+    for shape in _PH_SHAPE_XPATH(layout):
+        ph = _PH_XPATH(shape)[0]
+        ph_type = ph.get("type", "obj")
+        values = _xfrm_values(shape)
+        # Only autoshape placeholders inherit from the master
+        if shape.tag == _SP:
+            values = _inherit(values, master_positions.get(_BASE_PH_TYPE.get(ph_type)))
+
+        placeholder_info = {
+            "type": PP_PLACEHOLDER.from_xml(ph_type),
+            "idx": int(ph.get("idx", "0")),
+            "name": _NAME_XPATH(shape)[0],
+        }
+        placeholder_info.update(zip(_DIMENSIONS, values))
+        placeholders.append(placeholder_info)
+    return placeholders
+
+
+def _shape_type(shape) -> Optional[MSO_SHAPE_TYPE]:
+    """The MSO_SHAPE_TYPE python-pptx reports for a slide shape element"""
+    tag = shape.tag
+    if tag == _SP:
+        if _PH_XPATH(shape):
+            return MSO_SHAPE_TYPE.PLACEHOLDER
+        if _CUST_GEOM_XPATH(shape):
+            return MSO_SHAPE_TYPE.FREEFORM
+        is_text_box = _xsd_bool(next(iter(_TX_BOX_XPATH(shape)), None))
+        if _PRST_GEOM_XPATH(shape) and not is_text_box:
+            return MSO_SHAPE_TYPE.AUTO_SHAPE
+        if is_text_box:
+            return MSO_SHAPE_TYPE.TEXT_BOX
+        return None
+    if tag == _PIC:
+        return MSO_SHAPE_TYPE.MEDIA if _VIDEO_FILE_XPATH(shape) else MSO_SHAPE_TYPE.PICTURE
+    if tag == _GRAPHIC_FRAME:
+        uri = next(iter(_GRAPHIC_DATA_URI_XPATH(shape)), None)
+        if uri == _GRAPHIC_DATA_URI_CHART:
+            return MSO_SHAPE_TYPE.CHART
+        if uri == _GRAPHIC_DATA_URI_TABLE:
+            return MSO_SHAPE_TYPE.TABLE
+        if uri == _GRAPHIC_DATA_URI_OLEOBJ:
+            if _OLE_EMBED_XPATH(shape):
+                return MSO_SHAPE_TYPE.EMBEDDED_OLE_OBJECT
+            return MSO_SHAPE_TYPE.LINKED_OLE_OBJECT
+        return None
+    if tag == _qn("p:grpSp"):
+        return MSO_SHAPE_TYPE.GROUP
+    if tag == _qn("p:cxnSp"):
+        return MSO_SHAPE_TYPE.LINE
+    return None
+
+
+def _paragraph_text(paragraph) -> str:
+    """Run and field text, with line breaks as vertical tabs"""
+    parts = []
+    for child in paragraph:
+        if child.tag == _BR:
+            parts.append("\v")
+        elif child.tag in (_R, _FLD):
+            parts.extend(_TEXT_XPATH(child))
+    return "".join(parts)
+
+
+def _text_and_font(shape, shape_info: Dict[str, Any]) -> None:
+    """Add text, first-run font and solid fill of an autoshape to shape_info"""
+    shape_info["has_text"] = True
+    paragraphs = _PARAGRAPHS_XPATH(shape)
+    shape_info["text"] = "\n".join(_paragraph_text(p) for p in paragraphs)[:100]
+
+    if paragraphs and paragraphs[0].find(_R) is not None:
+        rpr = next(iter(_FIRST_RUN_PROPS_XPATH(paragraphs[0])), None)
+        if rpr is None:
+            font_info = {"name": None, "size": None, "bold": None, "italic": None}
+        else:
+            size = rpr.get("sz")
+            font_info = {
+                "name": next(iter(_LATIN_TYPEFACE_XPATH(rpr)), None),
+                # Hundredths of a point to EMU
+                "size": int(size) * 127 if size is not None else None,
+                "bold": _xsd_bool(rpr.get("b")),
+                "italic": _xsd_bool(rpr.get("i")),
+            }
+            color = _SOLID_FILL_RGB_XPATH(rpr)
+            if color:
+                font_info["color_rgb"] = color[0].upper()
+        shape_info["font"] = font_info
+
+    fill = _SHAPE_FILL_RGB_XPATH(shape)
+    if fill:
+        shape_info["fill_color_rgb"] = fill[0].upper()
+
+
+def _iter_slide_shapes(f):
+    """Stream the top-level shape elements of a slide part, freeing each one after use"""
+    for _, elem in etree.iterparse(f, events=("end",), tag=_SHAPE_TAGS):
+        if elem.getparent().tag == _SP_TREE:
+            yield elem
+            elem.clear()
+            # Drop already-processed siblings so the tree never grows
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+
+def _slide_shapes(package: _Package, slide_part: str,
+                  layout_placeholders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Shape summaries for one slide"""
+    shapes = []
+    with package.open(slide_part) as f:
+        for shape in _iter_slide_shapes(f):
+            values = _xfrm_values(shape)
+            ph = _PH_XPATH(shape) if shape.tag in (_SP, _PIC) else None
+            if ph:
+                # Slide placeholders inherit from the layout placeholder with the same idx
+                idx = int(ph[0].get("idx", "0"))
+                base = next((p for p in layout_placeholders if p["idx"] == idx), None)
+                if base is not None:
+                    values = _inherit(values, [base[d] for d in _DIMENSIONS])
+
+            shape_info = {"name": _NAME_XPATH(shape)[0], "type": str(_shape_type(shape))}
+            shape_info.update(zip(_DIMENSIONS, values))
+            if shape.tag == _SP:
+                _text_and_font(shape, shape_info)
+            shapes.append(shape_info)
+    return shapes
 
 
 def extract_template_design(template_path: str):
@@ -15,86 +298,55 @@ def extract_template_design(template_path: str):
     Returns:
         Dictionary with colors, fonts, backgrounds, layouts
     """
-    prs = Presentation(template_path)
-
-    design_info = {
-        "slide_count": len(prs.slides),
-        "layout_count": len(prs.slide_layouts),
-        "slide_width": prs.slide_width,
-        "slide_height": prs.slide_height,
-        "layouts": [],
-        "sample_slides": []
-    }
-
-    # Extract layout information
-    for i, layout in enumerate(prs.slide_layouts):
-        layout_info = {
-            "index": i,
-            "name": layout.name,
-            "placeholders": []
-        }
+    with zipfile.ZipFile(template_path) as zf:
+        package = _Package(zf)
+        presentation_part = package.related("", _RT_OFFICE_DOCUMENT)
+        presentation = package.parse(presentation_part)
+        presentation_rels = package.rels(presentation_part)["by_id"]
+        slide_parts = [presentation_rels[rid] for rid in _SLD_ID_XPATH(presentation)]
+        slide_size = _SLD_SZ_XPATH(presentation)
 
-        for shape in layout.placeholders:
-            placeholder_info = {
-                "type": shape.placeholder_format.type,
-                "idx": shape.placeholder_format.idx,
-                "name": shape.name,
-                "left": shape.left,
-                "top": shape.top,
-                "width": shape.width,
-                "height": shape.height
-            }
-            layout_info["placeholders"].append(placeholder_info)
+        # Layout placeholders with resolved positions, by layout part
+        layouts: Dict[str, List[Dict[str, Any]]] = {}
+
+        def layout_placeholders(layout_part: str, layout) -> List[Dict[str, Any]]:
+            if layout_part not in layouts:
+                master_part = package.related(layout_part, _RT_SLIDE_MASTER)
+                master_positions = _master_positions(package.parse(master_part)) if master_part else {}
+                layouts[layout_part] = _layout_placeholders(layout, master_positions)
+            return layouts[layout_part]
 
-        design_info["layouts"].append(layout_info)
+        # prs.slide_layouts: the layouts of the first slide master
+        master_part = presentation_rels[_SLD_MASTER_ID_XPATH(presentation)[0]]
+        master_rels = package.rels(master_part)["by_id"]
+        layout_parts = [master_rels[rid] for rid in _SLD_LAYOUT_ID_XPATH(package.parse(master_part))]
 
-    # Extract sample slides to see actual styling
-    slide_list = list(prs.slides)
-    for i, slide in enumerate(slide_list[:3]):  # First 3 slides
-        slide_info = {
-            "slide_number": i + 1,
-            "shapes": []
+        design_info = {
+            "slide_count": len(slide_parts),
+            "layout_count": len(layout_parts),
+            "slide_width": int(slide_size[0].get("cx")) if slide_size else None,
+            "slide_height": int(slide_size[0].get("cy")) if slide_size else None,
+            "layouts": [],
+            "sample_slides": []
         }
 
-        for shape in slide.shapes:
-            shape_info = {
-                "name": shape.name,
-                "type": str(shape.shape_type),
-                "left": shape.left,
-                "top": shape.top,
-                "width": shape.width,
-                "height": shape.height
-            }
+        # Extract layout information
+        for i, layout_part in enumerate(layout_parts):
+            layout = package.parse(layout_part)
+            design_info["layouts"].append({
+                "index": i,
+                "name": next(iter(_LAYOUT_NAME_XPATH(layout)), ""),
+                "placeholders": layout_placeholders(layout_part, layout)
+            })
 
-            # Extract text if present
-            if hasattr(shape, "text_frame"):
-                shape_info["has_text"] = True
-                shape_info["text"] = shape.text[:100] if shape.text else ""
-
-                # Get font info from first paragraph
-                if shape.text_frame.paragraphs:
-                    para = shape.text_frame.paragraphs[0]
-                    if para.runs:
-                        run = para.runs[0]
-                        font_info = {
-                            "name": run.font.name,
-                            "size": run.font.size,
-                            "bold": run.font.bold,
-                            "italic": run.font.italic
-                        }
-                        if run.font.color and run.font.color.rgb:
-                            font_info["color_rgb"] = str(run.font.color.rgb)
-                        shape_info["font"] = font_info
-
-            # Extract fill color
-            if hasattr(shape, "fill"):
-                if shape.fill.type == 1:  # Solid fill
-                    if hasattr(shape.fill, 'fore_color') and shape.fill.fore_color.rgb:
-                        shape_info["fill_color_rgb"] = str(shape.fill.fore_color.rgb)
-
-            slide_info["shapes"].append(shape_info)
-
-        design_info["sample_slides"].append(slide_info)
+        # Extract sample slides to see actual styling
+        for i, slide_part in enumerate(slide_parts[:SAMPLE_SLIDE_COUNT]):
+            layout_part = package.related(slide_part, _RT_SLIDE_LAYOUT)
+            placeholders = layout_placeholders(layout_part, package.parse(layout_part)) if layout_part else []
+            design_info["sample_slides"].append({
+                "slide_number": i + 1,
+                "shapes": _slide_shapes(package, slide_part, placeholders)
+            })
 
     return design_info
 
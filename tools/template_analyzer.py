@@ -4,20 +4,64 @@ Extracts structure from PPTX templates and generates callable functions
 """
 
 import os
+import re
 import json
+import copy
 import hashlib
-from typing import Dict, Any
+import string
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Tuple
 from pptx import Presentation
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 
+try:
+    from ._layout_scan import scan_layout_placeholders
+    from .disk_cache import disk_cached
+except ImportError:
+    # Running as a standalone script
+    from _layout_scan import scan_layout_placeholders
+    from disk_cache import disk_cached
 
-def generate_template_id(template_file_path: str) -> str:
-    """Generate unique template ID from file path"""
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Slide classification patterns
+_TITLE_KEYWORD_RE = re.compile(r'title|presentation', re.IGNORECASE)
+_SECTION_NUMBER_RE = re.compile(r'0[1-9]|10')
+
+# Source of the generated template class, filled in by generate_template_functions
+_CLASS_TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "template_class.py.tmpl")
+
+
+def _template_slug(template_file_path: str) -> str:
+    """Readable identifier derived from the template file name"""
     basename = os.path.basename(template_file_path)
     name_without_ext = os.path.splitext(basename)[0]
-    # Create simple readable ID
-    template_id = name_without_ext.lower().replace(' ', '_').replace('-', '_')
-    return template_id
+    return name_without_ext.lower().replace(' ', '_').replace('-', '_')
+
+
+def generate_template_id(template_file_path: str) -> str:
+    """
+    Generate unique template ID from file name and content
+
+    Two different templates that share a file name get different IDs, and
+    identical files get the same ID wherever they live.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    with open(template_file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return f"{_template_slug(template_file_path)}_{digest.hexdigest()}"
+
+
+def _file_cache_key(file_path: str) -> Tuple[str, int, int]:
+    """Build (absolute path, mtime_ns, size) key so edited files miss the cache"""
+    stat = os.stat(file_path)
+    return os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size
 
 
 def analyze_ppt_template(template_file_path: str) -> Dict[str, Any]:
@@ -33,6 +77,17 @@ def analyze_ppt_template(template_file_path: str) -> Dict[str, Any]:
     if not os.path.exists(template_file_path):
         raise FileNotFoundError(f"Template file not found: {template_file_path}")
 
+    _, mtime_ns, size = _file_cache_key(template_file_path)
+
+    # Copy so callers can't mutate the memoized result
+    return copy.deepcopy(_analyze_ppt_template(template_file_path, mtime_ns, size))
+
+
+# Disk cache version 2: positions rounded half-up by _layout_scan.emu_to_inches
+@functools.lru_cache(maxsize=32)
+@disk_cached(version=2)
+def _analyze_ppt_template(template_file_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Build template metadata, memoized in memory and on disk by file path, mtime and size"""
     prs = Presentation(template_file_path)
 
     metadata = {
@@ -46,39 +101,10 @@ def analyze_ppt_template(template_file_path: str) -> Dict[str, Any]:
         "available_slide_types": []
     }
 
-    # Extract each layout
-    for idx, layout in enumerate(prs.slide_layouts):
-        layout_info = {
-            "layout_id": f"layout_{idx}",
-            "layout_index": idx,
-            "layout_name": layout.name,
-            "slots": {}
-        }
-
-        # Extract placeholders
-        for shape in layout.placeholders:
-            slot_info = {
-                "placeholder_type": str(shape.placeholder_format.type),
-                "placeholder_idx": shape.placeholder_format.idx,
-                "name": shape.name,
-                "position": {
-                    "left_inches": round(shape.left.inches, 2),
-                    "top_inches": round(shape.top.inches, 2),
-                    "width_inches": round(shape.width.inches, 2),
-                    "height_inches": round(shape.height.inches, 2)
-                }
-            }
-
-            # Try to get text info if available
-            if shape.has_text_frame:
-                slot_info["has_text_frame"] = True
-
-            layout_info["slots"][shape.name] = slot_info
-
-        # Also capture background and other shapes
-        layout_info["total_shapes"] = len(layout.shapes)
-
-        metadata["layouts"].append(layout_info)
+    # Extract each layout; layouts are independent, read-only work
+    layouts = list(prs.slide_layouts)
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        metadata["layouts"] = list(executor.map(_extract_layout, range(len(layouts)), layouts))
 
     # Extract sample slide types from existing slides
     slide_types = []
@@ -97,31 +123,59 @@ def analyze_ppt_template(template_file_path: str) -> Dict[str, Any]:
     return metadata
 
 
+def _extract_layout(idx: int, layout) -> Dict[str, Any]:
+    """Extract slot metadata for one slide layout"""
+    layout_info = {
+        "layout_id": f"layout_{idx}",
+        "layout_index": idx,
+        "layout_name": layout.name,
+        "slots": {}
+    }
+
+    # Extract placeholders straight from the layout XML
+    layout_info["slots"] = scan_layout_placeholders(layout.element, functools.partial(_resolve_emus, layout))
+
+    # Also capture background and other shapes
+    layout_info["total_shapes"] = len(layout.shapes)
+
+    return layout_info
+
+
+def _resolve_emus(layout, ph_shape) -> List[int]:
+    """Position of a layout placeholder as resolved by python-pptx, including inheritance"""
+    shape = layout.placeholders._shape_factory(ph_shape)
+    return [shape.left, shape.top, shape.width, shape.height]
+
+
 def _classify_slide_type(slide) -> str:
     """Classify slide type based on content"""
-    shapes = list(slide.shapes)
-
-    # Count text shapes with content
-    text_shapes = [s for s in shapes if hasattr(s, 'text') and s.text.strip()]
+    # Count text shapes with content; python-pptx rebuilds .text on every
+    # access, so read it once per shape
+    text_shapes = []
+    for shape in slide.shapes:
+        text = getattr(shape, 'text', None)
+        if text and text.strip():
+            text_shapes.append((shape, text))
 
     if not text_shapes:
         return "Background/Design slide"
 
     # Check for large title text
-    for shape in text_shapes:
+    for shape, text in text_shapes:
         if hasattr(shape, 'text_frame'):
             for para in shape.text_frame.paragraphs:
-                if para.runs:
-                    font_size = para.runs[0].font.size
+                runs = para.runs
+                if runs:
+                    font_size = runs[0].font.size
                     if font_size and font_size > 400000:  # Large font (>30pt)
-                        if any(keyword in shape.text.lower() for keyword in ['title', 'presentation']):
+                        if _TITLE_KEYWORD_RE.search(text):
                             return "Title slide"
                         else:
                             return "Section header slide"
 
-    # Check for numbered sections
-    for shape in text_shapes:
-        if shape.text.strip() in ['01', '02', '03', '04', '05', '06', '07', '08', '09', '10']:
+    # Check for numbered sections (01-10)
+    for _, text in text_shapes:
+        if _SECTION_NUMBER_RE.fullmatch(text.strip()):
             return "Section divider slide"
 
     # If multiple text shapes, likely content
@@ -131,6 +185,23 @@ def _classify_slide_type(slide) -> str:
     return "Content slide"
 
 
+def _write_json(data: Dict[str, Any], path: str) -> None:
+    """Write data as 2-space indented JSON, using orjson when installed"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_class_template() -> string.Template:
+    """Read the generated class template once per process"""
+    with open(_CLASS_TEMPLATE_PATH, 'r', encoding='utf-8') as f:
+        return string.Template(f.read())
+
+
 def generate_template_functions(template_metadata: Dict[str, Any], output_dir: str = "templates") -> str:
     """
     Auto-generate Python functions from template metadata
@@ -146,285 +217,61 @@ def generate_template_functions(template_metadata: Dict[str, Any], output_dir: s
     template_id = template_metadata["template_id"]
     template_name = template_metadata["template_name"]
 
-    # Create class name (capitalize and remove underscores)
-    class_name = ''.join(word.capitalize() for word in template_id.split('_')) + "Template"
-
-    # Generate code
-    class_code = f'''"""
-Auto-generated template functions for: {template_name}
-Template ID: {template_id}
-Generated by: Template Analyzer Tool
-"""
-
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.enum.text import PP_ALIGN
-from pptx.dml.color import RGBColor
-from typing import List, Optional
-
-
-class {class_name}:
-    """
-    Auto-generated template functions
-    Template: {template_name}
-    """
+    output_path = os.path.join(output_dir, f"{template_id}_functions.py")
+    metadata_path = os.path.join(output_dir, f"{template_id}_metadata.json")
+    stamp_path = os.path.join(output_dir, f"{template_id}.sha")
 
-    def __init__(self, template_path: str):
-        """
-        Initialize template
-
-        Args:
-            template_path: Path to template PPTX file
-        """
-        # Load template to get layouts and styling
-        self.prs = Presentation(template_path)
-
-        # Remove all existing slides from template to start clean
-        while len(self.prs.slides) > 0:
-            rId = self.prs.slides._sldIdLst[0].rId
-            self.prs.part.drop_rel(rId)
-            del self.prs.slides._sldIdLst[0]
-
-        self.template_metadata = {json.dumps(template_metadata, indent=8)}
-        self.template_path = template_path
-
-    def add_title_slide(self, title: str, subtitle: str = None) -> None:
-        """
-        Add title slide
-
-        Args:
-            title: Main title text
-            subtitle: Subtitle text (optional)
-        """
-        layout = self.prs.slide_layouts[0]
-        slide = self.prs.slides.add_slide(layout)
-
-        # Add title as text box
-        title_box = slide.shapes.add_textbox(
-            Inches(1), Inches(2),
-            Inches(8), Inches(1)
-        )
-        title_frame = title_box.text_frame
-        title_frame.text = title
-        title_frame.paragraphs[0].font.size = Pt(44)
-        title_frame.paragraphs[0].font.bold = True
-        title_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-
-        # Add subtitle if provided
-        if subtitle:
-            subtitle_box = slide.shapes.add_textbox(
-                Inches(1), Inches(3.2),
-                Inches(8), Inches(0.8)
-            )
-            subtitle_frame = subtitle_box.text_frame
-            subtitle_frame.text = subtitle
-            subtitle_frame.paragraphs[0].font.size = Pt(24)
-            subtitle_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-
-    def add_content_slide(self, title: str, bullets: List[str]) -> None:
-        """
-        Add bullet point slide
-
-        Args:
-            title: Slide title
-            bullets: List of bullet points
-        """
-        # Use layout 1 if available, otherwise layout 0
-        layout_idx = min(1, len(self.prs.slide_layouts) - 1)
-        layout = self.prs.slide_layouts[layout_idx]
-        slide = self.prs.slides.add_slide(layout)
-
-        # Add title as text box if no title placeholder
-        title_box = slide.shapes.add_textbox(
-            Inches(0.5), Inches(0.5),
-            Inches(9), Inches(0.8)
-        )
-        title_frame = title_box.text_frame
-        title_frame.text = title
-        title_frame.paragraphs[0].font.size = Pt(32)
-        title_frame.paragraphs[0].font.bold = True
-
-        # Add bullets as text box
-        content_box = slide.shapes.add_textbox(
-            Inches(0.5), Inches(1.5),
-            Inches(9), Inches(4)
-        )
-        text_frame = content_box.text_frame
-        text_frame.word_wrap = True
-
-        for bullet in bullets:
-            p = text_frame.add_paragraph()
-            p.text = str(bullet)
-            p.level = 0
-            p.font.size = Pt(18)
-
-    def add_section_header_slide(self, title: str) -> None:
-        """
-        Add section header slide
-
-        Args:
-            title: Section title
-        """
-        # Try to find section header layout (often layout 2 or 3)
-        layout_idx = min(2, len(self.prs.slide_layouts) - 1)
-        layout = self.prs.slide_layouts[layout_idx]
-        slide = self.prs.slides.add_slide(layout)
-
-        if slide.shapes.title:
-            slide.shapes.title.text = title
-
-    def add_image_placeholder_slide(self, title: str, image_prompt: str,
-                                     context: str = None) -> None:
-        """
-        Add slide with image placeholder showing prompt
-
-        Args:
-            title: Slide title
-            image_prompt: AI-generated image prompt to display
-            context: Optional context about why this image
-        """
-        # Use blank or content layout
-        layout_idx = min(5, len(self.prs.slide_layouts) - 1)
-        layout = self.prs.slide_layouts[layout_idx]
-        slide = self.prs.slides.add_slide(layout)
-
-        # Add title box
-        title_box = slide.shapes.add_textbox(
-            Inches(0.5), Inches(0.5),
-            Inches(9), Inches(0.8)
-        )
-        title_frame = title_box.text_frame
-        title_frame.text = title
-        title_frame.paragraphs[0].font.size = Pt(32)
-        title_frame.paragraphs[0].font.bold = True
-
-        # Add image placeholder box
-        placeholder_box = slide.shapes.add_shape(
-            1,  # Rectangle (MSO_SHAPE.RECTANGLE)
-            Inches(1.5), Inches(2),
-            Inches(7), Inches(4)
-        )
-
-        # Style the placeholder
-        placeholder_box.fill.solid()
-        placeholder_box.fill.fore_color.rgb = RGBColor(232, 244, 248)  # Light blue
-        placeholder_box.line.color.rgb = RGBColor(30, 58, 138)  # Dark blue
-        placeholder_box.line.width = Pt(2)
-
-        # Add prompt text inside placeholder
-        text_frame = placeholder_box.text_frame
-        text_frame.word_wrap = True
-        text_frame.margin_left = Inches(0.3)
-        text_frame.margin_right = Inches(0.3)
-        text_frame.margin_top = Inches(0.3)
-
-        # Header
-        p1 = text_frame.paragraphs[0]
-        p1.text = "📷 IMAGE PROMPT:"
-        p1.font.size = Pt(14)
-        p1.font.bold = True
-        p1.font.color.rgb = RGBColor(30, 58, 138)
-
-        # Prompt text
-        p2 = text_frame.add_paragraph()
-        p2.text = image_prompt
-        p2.font.size = Pt(11)
-        p2.space_before = Pt(12)
-        p2.font.color.rgb = RGBColor(0, 0, 0)
-
-        # Context if provided
-        if context:
-            p3 = text_frame.add_paragraph()
-            p3.text = f"\\n💡 Context: {{context}}"
-            p3.font.size = Pt(10)
-            p3.font.italic = True
-            p3.space_before = Pt(12)
-            p3.font.color.rgb = RGBColor(75, 85, 99)
-
-    def add_two_column_slide(self, title: str, left_content: List[str],
-                            right_content: List[str]) -> None:
-        """
-        Add two-column comparison slide
-
-        Args:
-            title: Slide title
-            left_content: Left column bullet points
-            right_content: Right column bullet points
-        """
-        # Use any available layout
-        layout = self.prs.slide_layouts[0]
-        slide = self.prs.slides.add_slide(layout)
-
-        # Add title
-        title_box = slide.shapes.add_textbox(
-            Inches(0.5), Inches(0.5),
-            Inches(9), Inches(0.8)
-        )
-        title_frame = title_box.text_frame
-        title_frame.text = title
-        title_frame.paragraphs[0].font.size = Pt(32)
-        title_frame.paragraphs[0].font.bold = True
-
-        # Add two text boxes
-        left_box = slide.shapes.add_textbox(
-            Inches(0.5), Inches(1.5),
-            Inches(4.5), Inches(4)
-        )
-        right_box = slide.shapes.add_textbox(
-            Inches(5), Inches(1.5),
-            Inches(4.5), Inches(4)
-        )
-
-        # Fill left column
-        left_frame = left_box.text_frame
-        left_frame.word_wrap = True
-        for item in left_content:
-            p = left_frame.add_paragraph()
-            p.text = str(item)
-            p.font.size = Pt(14)
-
-        # Fill right column
-        right_frame = right_box.text_frame
-        right_frame.word_wrap = True
-        for item in right_content:
-            p = right_frame.add_paragraph()
-            p.text = str(item)
-            p.font.size = Pt(14)
-
-    def save(self, output_path: str) -> str:
-        """
-        Save the presentation
-
-        Args:
-            output_path: Path to save PPTX file
-
-        Returns:
-            Saved file path
-        """
-        self.prs.save(output_path)
+    # Leave existing output untouched (no watcher events, no bytecode
+    # invalidation) when it was generated from the same inputs
+    digest = _generation_digest(template_metadata)
+    if os.path.exists(output_path) and os.path.exists(metadata_path) and _read_stamp(stamp_path) == digest:
         return output_path
 
-    def get_slide_count(self) -> int:
-        """Get current number of slides"""
-        return len(self.prs.slides)
-'''
+    # Create class name (capitalize and remove underscores); the content hash
+    # in the ID only disambiguates files, so leave it out of the class name
+    class_name = ''.join(word.capitalize() for word in _template_slug(template_name).split('_')) + "Template"
+
+    # Generate code
+    class_code = _load_class_template().substitute(
+        class_name=class_name,
+        template_name=template_name,
+        template_id=template_id
+    )
 
     # Create output directory if needed
     os.makedirs(output_dir, exist_ok=True)
 
     # Save to file
-    output_path = os.path.join(output_dir, f"{template_id}_functions.py")
     with open(output_path, 'w', encoding='utf-8') as f:
         f.write(class_code)
 
     # Also save metadata JSON
-    metadata_path = os.path.join(output_dir, f"{template_id}_metadata.json")
-    with open(metadata_path, 'w', encoding='utf-8') as f:
-        json.dump(template_metadata, f, indent=2)
+    _write_json(template_metadata, metadata_path)
+
+    # Stamp last, so an interrupted run is regenerated next time
+    with open(stamp_path, 'w', encoding='utf-8') as f:
+        f.write(digest)
 
     return output_path
 
 
+def _generation_digest(template_metadata: Dict[str, Any]) -> str:
+    """Hash of everything the generated files depend on: metadata and class template"""
+    digest = hashlib.blake2b()
+    digest.update(_load_class_template().template.encode('utf-8'))
+    digest.update(json.dumps(template_metadata, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _read_stamp(stamp_path: str) -> str:
+    """Digest recorded by the last generation, or '' if there is none"""
+    try:
+        with open(stamp_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        return ""
+
+
 if __name__ == "__main__":
     # Test with example template
     import sys
@@ -4,263 +4,377 @@ Extracts structure from PPTX templates and uses AI to generate functions and des
 """
 
 import os
+import re
+import copy
 import json
-import base64
-from io import BytesIO
-from typing import Dict, Any, List
+import asyncio
+import keyword
+import weakref
+import functools
+import threading
+from typing import Dict, Any, List, Optional
 from pptx import Presentation
 from pptx.util import Inches, Pt
+from lxml import etree
 import google.generativeai as genai
+from google.generativeai import client as genai_client
+from google.api_core import exceptions as google_exceptions
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from ._layout_scan import NSMAP, SP_TAG, emus_to_inches
+    from .disk_cache import load_entry, store_entry
+    from .template_analyzer import generate_template_id
+except ImportError:
+    # Running as a standalone script
+    from _layout_scan import NSMAP, SP_TAG, emus_to_inches
+    from disk_cache import load_entry, store_entry
+    from template_analyzer import generate_template_id
+
 load_dotenv()
 
+MODEL_NAME = 'gemini-2.5-flash'
 
-def generate_template_id(template_file_path: str) -> str:
-    """Generate unique template ID from file path"""
-    basename = os.path.basename(template_file_path)
-    name_without_ext = os.path.splitext(basename)[0]
-    template_id = name_without_ext.lower().replace(' ', '_').replace('-', '_')
-    return template_id
+# Gemini requests in flight at once while analyzing a template
+MAX_CONCURRENT_REQUESTS = 10
 
+# Prompt size budget: at most this many shapes (largest first) are described,
+# and longer prompts are reported
+MAX_PROMPT_SHAPES = 20
+MAX_PROMPT_CHARS = 8000
 
-def export_slide_as_image(slide, slide_prs) -> bytes:
-    """
-    Export a single slide as PNG image for AI analysis
+# Seconds before a Gemini request is abandoned (and retried). Template analysis
+# is an offline job, so this is generous rather than interactive
+REQUEST_TIMEOUT = 900
 
-    Args:
-        slide: Slide object
-        slide_prs: Presentation containing the slide
+# Attempts per Gemini request; transient failures are retried with exponential backoff
+MAX_ATTEMPTS = 3
+RETRY_MAX_WAIT = 30
 
-    Returns:
-        PNG image bytes
-    """
-    # Create temporary presentation with just this slide
-    temp_prs = Presentation()
-    temp_prs.slide_width = slide_prs.slide_width
-    temp_prs.slide_height = slide_prs.slide_height
+# Slide prompt = prefix + per-slide details + suffix. The prefix is identical
+# for every slide, which lets Gemini reuse it (implicit prompt caching)
+_SLIDE_PROMPT_PREFIX = """Analyze the PowerPoint slide structure below and generate a Python function that creates it.
 
-    # Clone the slide
-    blank_layout = temp_prs.slide_layouts[0]
-    new_slide = temp_prs.slides.add_slide(blank_layout)
+Please provide a JSON response with:
+1. "analysis" - An object with:
+   - "slide_type" - What type of slide is this? (e.g., "title_slide", "section_header", "content_bullets", "two_column", "full_image", "chart_slide", etc.)
+   - "usage_description" - A single concise line (max 100 chars) describing what this slide should be used for
+   - "key_features" - List of 3-5 key visual/layout features
+   - "recommended_content" - What type of content works best (one line)
+   - "function_name" - Suggested Python function name (e.g., "add_title_slide", "add_section_header")
+2. "function_code" - A string with the Python code of the function named "function_name", where:
+   - Function should be a method of a class that has self.prs (Presentation object)
+   - Function should clone background from self.template_slides[BEST_INDEX] where BEST_INDEX is the most appropriate template slide
+   - Add textboxes on top using the exact positions from shape details
+   - Use proper imports: from pptx.util import Inches, Pt; from pptx.dml.color import RGBColor
+   - Parameters should accept dynamic content (title, content, bullets, etc.)
+   - Include comprehensive docstring with Args description
+   - Apply the exact font sizes and colors from the shape details
 
-    # Copy all shapes
-    for shape in slide.shapes:
-        try:
-            import copy
-            el = shape.element
-            newel = copy.deepcopy(el)
-            new_slide.shapes._spTree.insert_element_before(newel, 'p:extLst')
-        except:
-            pass
+"""
+_SLIDE_PROMPT_SUFFIX = """
 
-    # Save to BytesIO
-    img_bytes = BytesIO()
+Return ONLY valid JSON, no other text."""
 
-    # Note: python-pptx doesn't support direct image export
-    # We'll extract shape information instead
-    return None
+# Fields Gemini must return in "analysis", with their types
+_ANALYSIS_SCHEMA = {
+    "slide_type": str,
+    "usage_description": str,
+    "key_features": list,
+    "recommended_content": str,
+    "function_name": str,
+}
+
+# <a:off> and <a:ext> of a shape's own transform: p:spPr (sp, pic, cxnSp),
+# p:xfrm (graphicFrame) or p:grpSpPr (grpSp)
+_OFF_EXT_XPATH = etree.XPath(
+    "*[self::p:spPr or self::p:grpSpPr]/a:xfrm/*[self::a:off or self::a:ext]"
+    " | p:xfrm/*[self::a:off or self::a:ext]",
+    namespaces=NSMAP
+)
+
+# First run of a shape's text, its properties, and explicit RGB colors
+_FIRST_RUN_XPATH = etree.XPath("p:txBody/a:p[1]/a:r[1]", namespaces=NSMAP)
+_RPR_TAG = "{%s}rPr" % NSMAP["a"]
+_SOLID_FILL_RGB_XPATH = etree.XPath("a:solidFill/a:srgbClr/@val", namespaces=NSMAP, smart_strings=False)
+_SHAPE_FILL_RGB_XPATH = etree.XPath("p:spPr/a:solidFill/a:srgbClr/@val", namespaces=NSMAP, smart_strings=False)
+
+# Rate limits, timeouts and server-side errors
+_RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+    TimeoutError,
+)
+
+
+def _shape_area(shape_info: Dict[str, Any]) -> float:
+    """Area in square inches; 0 for shapes without a size"""
+    return (shape_info["width_inches"] or 0) * (shape_info["height_inches"] or 0)
+
+
+def _rgb_color(values: List[str]) -> Optional[str]:
+    """'RGBColor(r, g, b)' source for the first <a:srgbClr> val found, if any"""
+    if not values:
+        return None
+    try:
+        rgb = bytes.fromhex(values[0])
+    except ValueError:
+        return None
+    if len(rgb) != 3:
+        return None
+    return f"RGBColor({rgb[0]}, {rgb[1]}, {rgb[2]})"
 
 
-def analyze_slide_with_gemini(slide, slide_index: int, api_key: str) -> Dict[str, Any]:
+def _extract_shape_features(slide) -> Dict[str, Any]:
     """
-    Use Gemini to analyze slide and generate description
+    Extract the shape details the Gemini prompt is built from, in one pass
 
     Args:
         slide: Slide object
-        slide_index: Index of the slide
-        api_key: Google AI Studio API key
 
     Returns:
-        Dictionary with AI-generated analysis
+        Dictionary with "shapes" (per-shape position, text, font and fill
+        details) and "text_content" (text samples)
     """
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel('gemini-2.5-flash')
-
-    # Extract slide structure information
     slide_info = {
         "shapes": [],
         "text_content": []
     }
 
     for shape in slide.shapes:
-        shape_data = {
+        element = shape.element
+
+        # Read the position straight off the XML; only placeholders that
+        # inherit it from their layout go through python-pptx
+        off_ext = _OFF_EXT_XPATH(element)
+        if len(off_ext) == 2:
+            off, ext = off_ext
+            emus = (int(off.get("x")), int(off.get("y")), int(ext.get("cx")), int(ext.get("cy")))
+        else:
+            emus = (shape.left, shape.top, shape.width, shape.height)
+
+        # Integer EMU -> inches; None when the shape has no position at all
+        left, top, width, height = emus_to_inches(emus)
+
+        # Only shapes with a text frame have .text
+        text = getattr(shape, 'text', '')
+        shape_info = {
             "type": str(shape.shape_type),
-            "left": round(shape.left / 914400, 2),  # Convert to inches
-            "top": round(shape.top / 914400, 2),
-            "width": round(shape.width / 914400, 2),
-            "height": round(shape.height / 914400, 2)
+            "left_inches": left,
+            "top_inches": top,
+            "width_inches": width,
+            "height_inches": height,
+            "has_text": bool(text.strip())
         }
 
-        # Extract text if present
-        if hasattr(shape, 'text') and shape.text.strip():
-            shape_data["text"] = shape.text[:100]  # First 100 chars
-            slide_info["text_content"].append(shape.text[:100])
-
-            # Get font info
-            if hasattr(shape, 'text_frame') and shape.text_frame.paragraphs:
-                para = shape.text_frame.paragraphs[0]
-                if para.runs:
-                    run = para.runs[0]
-                    shape_data["font_size"] = run.font.size
-                    shape_data["font_bold"] = run.font.bold
-                    if run.font.color and hasattr(run.font.color, 'rgb'):
-                        try:
-                            shape_data["font_color"] = str(run.font.color.rgb)
-                        except:
-                            pass
-
-        # Get fill color
-        if hasattr(shape, 'fill'):
-            try:
-                if shape.fill.type == 1:  # Solid fill
-                    if hasattr(shape.fill.fore_color, 'rgb'):
-                        shape_data["fill_color"] = str(shape.fill.fore_color.rgb)
-            except:
-                pass
-
-        slide_info["shapes"].append(shape_data)
-
-    # Create prompt for Gemini
-    prompt = f"""Analyze this PowerPoint slide structure and provide:
-
-Slide Index: {slide_index}
-Number of shapes: {len(slide_info['shapes'])}
-Text content samples: {', '.join(slide_info['text_content'][:3])}
-
-Shape details:
-{json.dumps(slide_info['shapes'], indent=2)}
-
-Please provide a JSON response with:
-1. "slide_type" - What type of slide is this? (e.g., "title_slide", "section_header", "content_bullets", "two_column", "full_image", "chart_slide", etc.)
-2. "usage_description" - A single concise line (max 100 chars) describing what this slide should be used for
-3. "key_features" - List of 3-5 key visual/layout features
-4. "recommended_content" - What type of content works best (one line)
-5. "function_name" - Suggested Python function name (e.g., "add_title_slide", "add_section_header")
+        if shape_info["has_text"]:
+            shape_info["sample_text"] = text[:30]
+            slide_info["text_content"].append(text[:100])
+
+            # Font details of the first run, read from its <a:rPr>
+            run = _FIRST_RUN_XPATH(element)
+            if run:
+                rpr = run[0].find(_RPR_TAG)
+                if rpr is None:
+                    shape_info["font_bold"] = None
+                else:
+                    # Hundredths of a point
+                    size = int(rpr.get("sz", "0"))
+                    if size:
+                        shape_info["font_size_pt"] = round(size / 100)
+                    bold = rpr.get("b")
+                    shape_info["font_bold"] = None if bold is None else bold in ("1", "true")
+
+                    # Only explicit RGB colors; theme colors have no RGB value
+                    color = _rgb_color(_SOLID_FILL_RGB_XPATH(rpr))
+                    if color:
+                        shape_info["font_color_rgb"] = color
+
+        # Solid fill color of autoshapes
+        if element.tag == SP_TAG:
+            fill = _rgb_color(_SHAPE_FILL_RGB_XPATH(element))
+            if fill:
+                shape_info["fill_color_rgb"] = fill
+
+        slide_info["shapes"].append(shape_info)
+
+    return slide_info
+
+
+async def analyze_slide_with_gemini(slide_info: Dict[str, Any], slide_index: int, model) -> Dict[str, Any]:
+    """
+    Use Gemini to analyze a slide and generate the Python function that creates it
 
-Return ONLY valid JSON, no other text."""
+    Both come back from a single request.
 
-    try:
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
+    Args:
+        slide_info: Shape details from _extract_shape_features
+        slide_index: Index of the slide
+        model: Shared genai.GenerativeModel
 
-        # Clean up markdown code blocks if present
-        if result_text.startswith('```'):
-            lines = result_text.split('\n')
-            result_text = '\n'.join(lines[1:-1])  # Remove first and last line
+    Returns:
+        Dictionary with "analysis" (AI-generated analysis) and "function_code"
+    """
+    shapes_detail = slide_info["shapes"]
+    text_content = slide_info["text_content"]
+
+    # Bound the prompt on busy slides: only the largest shapes are described,
+    # still in document (z-)order
+    prompt_shapes = shapes_detail
+    if len(shapes_detail) > MAX_PROMPT_SHAPES:
+        largest = sorted(range(len(shapes_detail)), key=lambda i: _shape_area(shapes_detail[i]),
+                         reverse=True)[:MAX_PROMPT_SHAPES]
+        prompt_shapes = [shapes_detail[i] for i in sorted(largest)]
+    omitted = len(shapes_detail) - len(prompt_shapes)
+    omitted_note = f" ({omitted} smaller shapes omitted)" if omitted else ""
+
+    # Static instructions first so every slide's prompt shares the same prefix
+    prompt = "".join((
+        _SLIDE_PROMPT_PREFIX,
+        f"""Slide Index: {slide_index}
+Number of shapes: {len(shapes_detail)}
+Text content samples: {', '.join(text_content[:3])}
+
+Shape details{omitted_note}:
+""",
+        _dumps(prompt_shapes),
+        _SLIDE_PROMPT_SUFFIX
+    ))
+    if len(prompt) > MAX_PROMPT_CHARS:
+        print(f"Warning: prompt for slide {slide_index} is {len(prompt)} characters (budget {MAX_PROMPT_CHARS})")
+
+    # Identical prompts (re-runs on an unchanged template) are answered from disk
+    cache_key = ["gemini", MODEL_NAME, prompt]
+    cached = load_entry(cache_key)
+    if cached is not None:
+        # Entries written before validation existed may be malformed; treat
+        # those as a miss
+        try:
+            return _validate_slide_result(cached)
+        except ValueError:
+            pass
 
-        result = json.loads(result_text)
-        return result
+    try:
+        result = _parse_slide_response(await _generate_with_retry(model, prompt))
     except Exception as e:
         print(f"Warning: Gemini analysis failed for slide {slide_index}: {e}")
         # Fallback to basic analysis
-        return {
+        analysis = {
             "slide_type": "generic_slide",
-            "usage_description": f"Slide with {len(slide_info['shapes'])} shapes",
+            "usage_description": f"Slide with {len(shapes_detail)} shapes",
             "key_features": ["Custom layout"],
             "recommended_content": "General content",
             "function_name": f"add_slide_{slide_index}"
         }
+        return {
+            "analysis": analysis,
+            "function_code": _fallback_function_code(analysis)
+        }
 
+    # Only real answers are cached, so a failed slide is retried next run
+    store_entry(cache_key, result)
+    return result
 
-def generate_function_with_gemini(slide, slide_analysis: Dict[str, Any],
-                                   template_id: str, api_key: str) -> str:
+
+async def _generate_with_retry(model, prompt: str) -> str:
     """
-    Use Gemini to generate Python function code for creating this slide
+    Send a prompt to Gemini, retrying transient failures with exponential backoff
 
     Args:
-        slide: Slide object
-        slide_analysis: Analysis from analyze_slide_with_gemini
-        template_id: Template identifier
-        api_key: Google AI Studio API key
+        model: Shared genai.GenerativeModel
+        prompt: Prompt text
 
     Returns:
-        Generated Python function code
+        Response text
     """
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel('gemini-2.5-flash')
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            response = await asyncio.wait_for(model.generate_content_async(prompt), REQUEST_TIMEOUT)
+            return response.text
+        except _RETRYABLE_ERRORS as e:
+            if attempt == MAX_ATTEMPTS:
+                raise
+            wait = min(2 ** attempt, RETRY_MAX_WAIT)
+            print(f"Warning: Gemini request failed ({e}), retrying in {wait}s...")
+            await asyncio.sleep(wait)
 
-    # Extract detailed slide structure
-    shapes_detail = []
-    for shape in slide.shapes:
-        shape_info = {
-            "type": str(shape.shape_type),
-            "left_inches": round(shape.left / 914400, 2),
-            "top_inches": round(shape.top / 914400, 2),
-            "width_inches": round(shape.width / 914400, 2),
-            "height_inches": round(shape.height / 914400, 2),
-            "has_text": hasattr(shape, 'text') and bool(shape.text.strip())
-        }
 
-        if shape_info["has_text"]:
-            shape_info["sample_text"] = shape.text[:50]
-
-            # Font details
-            if hasattr(shape, 'text_frame') and shape.text_frame.paragraphs:
-                para = shape.text_frame.paragraphs[0]
-                if para.runs:
-                    run = para.runs[0]
-                    if run.font.size:
-                        shape_info["font_size_pt"] = round(run.font.size / 12700)
-                    shape_info["font_bold"] = run.font.bold
-
-                    if run.font.color and hasattr(run.font.color, 'rgb'):
-                        try:
-                            rgb = run.font.color.rgb
-                            shape_info["font_color_rgb"] = f"RGBColor({rgb[0]}, {rgb[1]}, {rgb[2]})"
-                        except:
-                            pass
-
-        # Fill color
-        try:
-            if hasattr(shape, 'fill') and shape.fill.type == 1:
-                if hasattr(shape.fill.fore_color, 'rgb'):
-                    rgb = shape.fill.fore_color.rgb
-                    shape_info["fill_color_rgb"] = f"RGBColor({rgb[0]}, {rgb[1]}, {rgb[2]})"
-        except:
-            pass
+def _parse_slide_response(text: str) -> Dict[str, Any]:
+    """
+    Parse and validate Gemini's answer for one slide
 
-        shapes_detail.append(shape_info)
+    The JSON object is taken from the first '{' to the last '}', so markdown
+    fences or chatty text around it don't matter.
 
-    prompt = f"""Generate a Python function to create this PowerPoint slide.
+    Args:
+        text: Raw response text
 
-Slide Type: {slide_analysis['slide_type']}
-Function Name: {slide_analysis['function_name']}
-Usage: {slide_analysis['usage_description']}
+    Returns:
+        {"analysis": ..., "function_code": ...}
 
-Shape Details:
-{json.dumps(shapes_detail, indent=2)}
+    Raises:
+        ValueError: No JSON object, or see _validate_slide_result
+    """
+    start = text.find('{')
+    end = text.rfind('}')
+    if start == -1 or end < start:
+        raise ValueError("no JSON object in response")
+    return _validate_slide_result(_loads(text[start:end + 1]))
 
-Requirements:
-1. Function should be a method of a class that has self.prs (Presentation object)
-2. Function should clone background from self.template_slides[BEST_INDEX] where BEST_INDEX is the most appropriate template slide
-3. Add textboxes on top using the exact positions from shape details
-4. Use proper imports: from pptx.util import Inches, Pt; from pptx.dml.color import RGBColor
-5. Parameters should accept dynamic content (title, content, bullets, etc.)
-6. Include comprehensive docstring with Args description
-7. Apply the exact font sizes and colors from the shape details
 
-Return ONLY the Python function code, no markdown formatting, no explanations."""
+def _validate_slide_result(result: Any) -> Dict[str, Any]:
+    """
+    Check a slide answer (fresh or cached) against _ANALYSIS_SCHEMA
 
-    try:
-        response = model.generate_content(prompt)
-        function_code = response.text.strip()
-
-        # Clean up markdown code blocks
-        if function_code.startswith('```python'):
-            lines = function_code.split('\n')
-            function_code = '\n'.join(lines[1:-1])
-        elif function_code.startswith('```'):
-            lines = function_code.split('\n')
-            function_code = '\n'.join(lines[1:-1])
-
-        return function_code
-    except Exception as e:
-        print(f"Warning: Function generation failed: {e}")
-        return f"""
-    def {slide_analysis['function_name']}(self, title: str = "", content: str = "") -> None:
+    Args:
+        result: Decoded {"analysis": ..., "function_code": ...} object
+
+    Returns:
+        The analysis and the stripped function code
+
+    Raises:
+        ValueError: Fields missing or of the wrong type, an unusable function
+            name, or function code that doesn't define that function
+    """
+    analysis = result.get("analysis") if isinstance(result, dict) else None
+    if not isinstance(analysis, dict):
+        raise ValueError("response has no analysis object")
+    for field, field_type in _ANALYSIS_SCHEMA.items():
+        if not isinstance(analysis.get(field), field_type):
+            raise ValueError(f"analysis.{field} missing or not {field_type.__name__}")
+    if not all(isinstance(feature, str) for feature in analysis["key_features"]):
+        raise ValueError("analysis.key_features must be a list of str")
+
+    name = analysis["function_name"]
+    if not name.isidentifier() or keyword.iskeyword(name):
+        raise ValueError(f"invalid function name: {name!r}")
+
+    function_code = result.get("function_code")
+    if not isinstance(function_code, str):
+        raise ValueError("function_code missing or not str")
+    # _reuse_result renames the method through this definition
+    if not re.search(r'\bdef %s\(' % re.escape(name), function_code):
+        raise ValueError(f"function_code does not define {name}()")
+
+    return {
+        "analysis": analysis,
+        "function_code": function_code.strip()
+    }
+
+
+def _fallback_function_code(analysis: Dict[str, Any]) -> str:
+    """Placeholder method used when Gemini couldn't generate one"""
+    return f"""
+    def {analysis['function_name']}(self, title: str = "", content: str = "") -> None:
         \"\"\"
-        {slide_analysis['usage_description']}
+        {analysis['usage_description']}
 
         Args:
             title: Slide title
@@ -272,12 +386,174 @@ Return ONLY the Python function code, no markdown formatting, no explanations.""
 """
 
 
-def analyze_ppt_template_with_ai(template_file_path: str) -> Dict[str, Any]:
+def _dumps(data: Any) -> str:
+    """Compact JSON text, using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(data).decode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+
+def _loads(text: str) -> Any:
+    """Parse JSON text, using orjson when installed"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _write_json(data: Any, path: str) -> None:
+    """
+    Write 2-space indented JSON, streamed chunk by chunk so the whole
+    document is never held in memory
+    """
+    encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(encoder.iterencode(data))
+
+
+@functools.lru_cache(maxsize=1)
+def _init_genai(api_key: str) -> None:
+    """
+    Configure genai once per API key
+
+    genai.configure is process-wide, so only the most recently configured API
+    key can be live; the cache remembers just that one. The transport is left
+    at its default: the async client used for the slide fan-out needs
+    grpc_asyncio, which an explicit transport='grpc' would replace.
+
+    Args:
+        api_key: Google AI Studio API key
+    """
+    genai.configure(api_key=api_key)
+    # Models hold on to the client of the key they were first used with
+    _LOOP_MODELS.clear()
+
+
+# Models per event loop and name. genai shares one async gRPC client across
+# the process, but a gRPC channel only works on the event loop it was first
+# used on, so every loop gets models with a client of its own.
+_LOOP_MODELS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, genai.GenerativeModel]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _configured_model(name: str = MODEL_NAME) -> genai.GenerativeModel:
     """
-    Enhanced template analysis using Gemini AI
+    Gemini model for the running event loop, built once per loop and name;
+    call _init_genai first
+
+    Args:
+        name: Gemini model name
+
+    Returns:
+        genai.GenerativeModel shared by everything on this loop
+    """
+    models = _LOOP_MODELS.setdefault(asyncio.get_running_loop(), {})
+    model = models.get(name)
+    if model is None:
+        model = genai.GenerativeModel(name)
+        # genai has no public way to build a client other than the shared one
+        model._async_client = genai_client._client_manager.make_client("generative_async")
+        models[name] = model
+    return model
+
+
+# Event loop of each thread calling the blocking analyze_ppt_template_with_ai
+_THREAD_STATE = threading.local()
+
+
+def _run(coro):
+    """
+    Run a coroutine to completion on this thread's persistent event loop
+
+    Reusing the loop (asyncio.run would make a new one each time) lets repeated
+    analyses in a thread share its models and their gRPC connections.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        coro.close()
+        raise RuntimeError("analyze_ppt_template_with_ai can't run inside an event loop; "
+                           "await analyze_ppt_template_with_ai_async instead")
+
+    loop = getattr(_THREAD_STATE, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _THREAD_STATE.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(coro)
+
+
+async def _analyze_slides(slide_infos: List[Dict[str, Any]], model,
+                          max_concurrency: int = MAX_CONCURRENT_REQUESTS) -> List[Dict[str, Any]]:
+    """
+    Run analyze_slide_with_gemini for every slide concurrently
+
+    Args:
+        slide_infos: Shape details of each slide, from _extract_shape_features
+        model: Shared genai.GenerativeModel
+        max_concurrency: Maximum number of Gemini requests in flight
+
+    Returns:
+        List of analysis results, in slide order
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def analyze_one(slide_info: Dict[str, Any], idx: int) -> Dict[str, Any]:
+        async with semaphore:
+            return await analyze_slide_with_gemini(slide_info, idx, model)
+
+    # Only the first slide of each distinct layout is sent to Gemini; slides
+    # repeating that layout reuse its answer
+    signatures = [_layout_signature(slide_info) for slide_info in slide_infos]
+    first_index: Dict[tuple, int] = {}
+    for idx, signature in enumerate(signatures):
+        first_index.setdefault(signature, idx)
+
+    unique_indexes = sorted(first_index.values())
+    if len(unique_indexes) < len(slide_infos):
+        print(f"[AI Template Analyzer] {len(slide_infos) - len(unique_indexes)} slide(s) repeat an earlier layout, reusing its analysis")
+
+    answers = await asyncio.gather(*(analyze_one(slide_infos[idx], idx) for idx in unique_indexes))
+    answer_by_index = dict(zip(unique_indexes, answers))
+
+    results = []
+    for idx, signature in enumerate(signatures):
+        source = first_index[signature]
+        result = answer_by_index[source]
+        results.append(result if source == idx else _reuse_result(result, idx))
+    return results
+
+
+def _layout_signature(slide_info: Dict[str, Any]) -> tuple:
+    """Shape types, positions and which shapes hold text; equal for slides sharing a layout"""
+    return tuple(
+        (shape["type"], shape["left_inches"], shape["top_inches"],
+         shape["width_inches"], shape["height_inches"], shape["has_text"])
+        for shape in slide_info["shapes"]
+    )
+
+
+def _reuse_result(result: Dict[str, Any], slide_index: int) -> Dict[str, Any]:
+    """Copy another slide's analysis and function, renamed to stay unique"""
+    analysis = copy.deepcopy(result["analysis"])
+    name = analysis["function_name"]
+    analysis["function_name"] = f"{name}_{slide_index}"
+    function_code = re.sub(r'\bdef %s\(' % re.escape(name), f"def {analysis['function_name']}(",
+                           result["function_code"], count=1)
+    return {
+        "analysis": analysis,
+        "function_code": function_code
+    }
+
+
+async def analyze_ppt_template_with_ai_async(template_file_path: str,
+                                             max_concurrency: int = MAX_CONCURRENT_REQUESTS) -> Dict[str, Any]:
+    """
+    Enhanced template analysis using Gemini AI, for async callers
 
     Args:
         template_file_path: Path to PPTX template
+        max_concurrency: Maximum number of Gemini requests in flight
 
     Returns:
         Enhanced metadata with AI analysis and generated functions
@@ -318,19 +594,18 @@ def analyze_ppt_template_with_ai(template_file_path: str) -> Dict[str, Any]:
         }
         metadata["powerpoint_layouts"].append(layout_info)
 
-    # Analyze each slide with Gemini
+    # Analyze all slides with Gemini, one request per slide, concurrently
     slides_list = list(prs.slides)
     generated_functions = []
 
-    for idx, slide in enumerate(slides_list):
-        print(f"[AI Template Analyzer] Analyzing slide {idx + 1}/{len(slides_list)}...")
-
-        # Get AI analysis
-        analysis = analyze_slide_with_gemini(slide, idx, api_key)
+    print(f"[AI Template Analyzer] Analyzing {len(slides_list)} slides...")
+    slide_infos = [_extract_shape_features(slide) for slide in slides_list]
+    _init_genai(api_key)
+    model = _configured_model()
+    results = await _analyze_slides(slide_infos, model, max_concurrency)
 
-        # Generate function code
-        print(f"[AI Template Analyzer] Generating function: {analysis['function_name']}...")
-        function_code = generate_function_with_gemini(slide, analysis, template_id, api_key)
+    for idx, (slide_info, result) in enumerate(zip(slide_infos, results)):
+        analysis = result["analysis"]
 
         slide_metadata = {
             "slide_index": idx,
@@ -339,7 +614,7 @@ def analyze_ppt_template_with_ai(template_file_path: str) -> Dict[str, Any]:
             "key_features": analysis['key_features'],
             "recommended_content": analysis['recommended_content'],
             "function_name": analysis['function_name'],
-            "shape_count": len(slide.shapes)
+            "shape_count": len(slide_info["shapes"])
         }
 
         metadata["analyzed_slides"].append(slide_metadata)
@@ -350,7 +625,7 @@ def analyze_ppt_template_with_ai(template_file_path: str) -> Dict[str, Any]:
 
         generated_functions.append({
             "function_name": analysis['function_name'],
-            "code": function_code
+            "code": result["function_code"]
         })
 
     print(f"[AI Template Analyzer] Analysis complete!")
@@ -363,15 +638,40 @@ def analyze_ppt_template_with_ai(template_file_path: str) -> Dict[str, Any]:
     return metadata
 
 
+def analyze_ppt_template_with_ai(template_file_path: str,
+                                 max_concurrency: int = MAX_CONCURRENT_REQUESTS) -> Dict[str, Any]:
+    """
+    Blocking wrapper around analyze_ppt_template_with_ai_async for non-async callers
+
+    Args:
+        template_file_path: Path to PPTX template
+        max_concurrency: Maximum number of Gemini requests in flight
+
+    Returns:
+        Enhanced metadata with AI analysis and generated functions
+    """
+    return _run(analyze_ppt_template_with_ai_async(template_file_path, max_concurrency))
+
+
 if __name__ == "__main__":
-    template_path = "presentation-template.pptx"
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Analyze a PPTX template with Gemini")
+    parser.add_argument("template_path", nargs="?", default="presentation-template.pptx",
+                        help="Path to the template (default: presentation-template.pptx)")
+    parser.add_argument("--max-concurrency", type=int, default=MAX_CONCURRENT_REQUESTS,
+                        help=f"Maximum Gemini requests in flight (default: {MAX_CONCURRENT_REQUESTS})")
+    args = parser.parse_args()
+    if args.max_concurrency < 1:
+        parser.error("--max-concurrency must be at least 1")
+    template_path = args.template_path
 
     print("=" * 70)
     print("AI-POWERED TEMPLATE ANALYSIS")
     print("=" * 70)
 
     try:
-        metadata = analyze_ppt_template_with_ai(template_path)
+        metadata = analyze_ppt_template_with_ai(template_path, max_concurrency=args.max_concurrency)
 
         # Save metadata
         os.makedirs("templates", exist_ok=True)
@@ -380,8 +680,7 @@ if __name__ == "__main__":
         # Don't save function codes in JSON (too large)
         function_codes = metadata.pop("_generated_function_codes")
 
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2)
+        _write_json(metadata, metadata_path)
 
         print(f"\n[PASS] Metadata saved: {metadata_path}")
         print(f"\n" + "=" * 70)